@@ -1,44 +1,66 @@
-﻿from fastapi import APIRouter, UploadFile, HTTPException, status
-from fastapi.responses import JSONResponse
+﻿from fastapi import APIRouter, Form, UploadFile, HTTPException, status
+from fastapi.responses import JSONResponse, StreamingResponse
+import hashlib
+import json
 import logging
 import os
+import re
+import time
 import uuid
 from pathlib import Path
 from pydantic import BaseModel
-from typing import List, Optional
-
-from app.services.document_processor import DocumentProcessor
-from app.models.document import DocumentChunk
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+from app.services.executor import run_blocking
+from app.services.ingestion import get_ingestion_queue
+from app.services.llm_client import LLMError, LLMRateLimitError
+from app.services.metrics import record_cache
+from app.services.rag.base_rag import document_filter
+from app.services.single_flight import generation_flights, request_key
 from app.config import settings
 
 router = APIRouter()
 UPLOAD_FOLDER = "uploads"
+# Upload ids are the SHA-256 of the file; older uploads got random UUIDs
+CONTENT_HASH_ID = re.compile(r"[0-9a-f]{64}")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class LLMCacheOptions(BaseModel):
+    # Skip the LLM response cache, or regenerate and overwrite the cached answer
+    use_cache: bool = True
+    refresh_cache: bool = False
+
+    def cache_kwargs(self) -> Dict[str, bool]:
+        return {"use_cache": self.use_cache, "refresh_cache": self.refresh_cache}
+
+
 # Add after existing imports
-class FlashcardGenerateRequest(BaseModel):
+class FlashcardGenerateRequest(LLMCacheOptions):
     doc_id: str
     topic: str
     num_cards: int = 10
     difficulty: str = "medium"
     card_types: Optional[List[str]] = ["definition", "concept", "application"]
-class SummarizeRequest(BaseModel):
+class SummarizeRequest(LLMCacheOptions):
     doc_id: str
     style: str = "concise"
     length: str = "medium"
+    # "retrieval" summarizes the top-k chunks; "map_reduce" reads every chunk of
+    # the document, summarizing groups concurrently before combining them
+    mode: Literal["retrieval", "map_reduce"] = "retrieval"
 
 
-class TopicSummarizeRequest(BaseModel):
+class TopicSummarizeRequest(LLMCacheOptions):
     doc_id: str
     topic: str
     style: str = "concise"
     length: str = "medium"
 
 
-class QAGenerateRequest(BaseModel):
+class QAGenerateRequest(LLMCacheOptions):
     doc_id: str
     topic: str
     num_questions: int = 5
@@ -46,52 +68,302 @@ class QAGenerateRequest(BaseModel):
     difficulty_levels: Optional[List[str]] = ["easy", "medium"]
 
 
+def _summary_prompt(req: SummarizeRequest, results: List[Dict[str, Any]]) -> str:
+    context = "\n\n".join([r["text"] for r in results])
+    return f"""Please generate a {req.length} summary of following document in a {req.style} style:
+
+{context}
+
+Summary:"""
+
+
+def _topic_summary_prompt(req: TopicSummarizeRequest, results: List[Dict[str, Any]]) -> str:
+    # Extract topic-specific content
+    context = "\n\n".join([r["text"] for r in results])
+
+    # Generate focused summary for specific topic
+    return f"""Please generate a {req.length} summary focused specifically on "{req.topic}" from the following document content. 
+Only summarize information related to {req.topic}. Ignore other topics. Use a {req.style} style.
+
+Document Content:
+{context}
+
+Topic-Specific Summary:"""
+
+
+async def _document_scope(rag_service, doc_id: str) -> Optional[Dict[str, Any]]:
+    """Filter limiting retrieval to the uploaded document behind ``doc_id``.
+
+    Upload ids are the stored ``document_id``; a content-hash id with no
+    stored chunks is unknown (404). Legacy ids from uploads made before ids
+    were content hashes search the whole collection, as every request did
+    before.
+    """
+    count = await run_blocking(rag_service.get_document_chunk_count, doc_id)
+    if count:
+        return document_filter(doc_id)
+    if CONTENT_HASH_ID.fullmatch(doc_id):
+        raise HTTPException(status_code=404, detail=f"No chunks stored for document: {doc_id}")
+    logger.warning(f"No chunks stored for legacy document id {doc_id}; searching the whole collection")
+    return None
+
+
+def _semantic_params(req: BaseModel) -> Dict[str, Any]:
+    # Everything that shapes the result except the topic itself
+    return req.model_dump(exclude={"doc_id", "topic", "use_cache", "refresh_cache"})
+
+
+async def _stored_summary(req: SummarizeRequest) -> Optional[Dict[str, Any]]:
+    """The summary precomputed at ingest for ``req.doc_id``, if there is one
+    and the caller did not opt out of cached answers."""
+    if not settings.PRECOMPUTE_SUMMARIES or not req.use_cache or req.refresh_cache:
+        return None
+    from app.services.summary_store import get_summary_store
+    stored = await run_blocking(lambda: get_summary_store().get(req.doc_id))
+    record_cache("summary_store", stored is not None)
+    return stored
+
+
+async def _replace_stored_summary(
+    req: SummarizeRequest, summary: Optional[str] = None, sections: Optional[List[str]] = None, chunks: int = 0
+) -> None:
+    """On ``refresh_cache``, overwrite the stored summary with a regenerated
+    map-reduce one; without sections to keep (retrieval mode) drop it."""
+    if not settings.PRECOMPUTE_SUMMARIES or not req.refresh_cache:
+        return
+    from app.services.summary_store import get_summary_store
+    store = get_summary_store()
+    if summary is None:
+        await run_blocking(store.delete, req.doc_id)
+        return
+    await run_blocking(lambda: store.put(
+        req.doc_id, style=req.style, length=req.length, summary=summary, sections=sections, chunks=chunks
+    ))
+
+
+async def _storing_summary(
+    pieces: AsyncIterator[str], req: SummarizeRequest, sections: List[str], chunks: int
+) -> AsyncIterator[str]:
+    """Pass a streamed map-reduce summary through, storing it once complete"""
+    parts = []
+    async for piece in pieces:
+        parts.append(piece)
+        yield piece
+    await _replace_stored_summary(req, "".join(parts), sections, chunks)
+
+
+async def _drop_summaries(document_ids: List[str]) -> None:
+    """Forget the precomputed summaries of document ids that no longer exist"""
+    if not settings.PRECOMPUTE_SUMMARIES or not document_ids:
+        return
+    from app.services.summary_store import get_summary_store
+    store = get_summary_store()
+    for document_id in document_ids:
+        await run_blocking(store.delete, document_id)
+
+
+def _map_reduce_summarizer(rag_service):
+    from app.services.academic.document_summarizer import DocumentSummarizer
+    return DocumentSummarizer(
+        rag_service,
+        group_size=settings.SUMMARY_GROUP_SIZE,
+        section_size=settings.SUMMARY_SECTION_SIZE
+    )
+
+
+def _restyle_prompt(stored: Dict[str, Any], req: SummarizeRequest) -> Optional[str]:
+    """None when the stored summary already has the requested style and length."""
+    if (stored["style"], stored["length"]) == (req.style, req.length):
+        return None
+    from app.services.academic.document_summarizer import DocumentSummarizer
+    return DocumentSummarizer.document_prompt(stored["sections"], req.style, req.length)
+
+
+async def _semantic_lookup(rag_service, endpoint: str, req: BaseModel) -> Optional[Dict[str, Any]]:
+    """Serve an earlier result for a semantically equivalent topic, if there is one."""
+    cache = getattr(rag_service, "semantic_cache", None)
+    if cache is None or not req.use_cache or req.refresh_cache:
+        return None
+
+    hit = await run_blocking(cache.lookup, endpoint, req.doc_id, req.topic, _semantic_params(req))
+    record_cache("semantic", hit is not None)
+    if hit is None:
+        return None
+
+    logger.info(f"Semantic cache hit for '{req.topic}' (matched '{hit['topic']}', {hit['similarity']})")
+    content = hit["result"]
+    content["topic"] = req.topic
+    content["semantic_cache"] = {"matched_topic": hit["topic"], "similarity": hit["similarity"]}
+    return content
+
+
+async def _semantic_store(rag_service, endpoint: str, req: BaseModel, content: Dict[str, Any]) -> None:
+    cache = getattr(rag_service, "semantic_cache", None)
+    if cache is not None and req.use_cache:
+        await run_blocking(cache.store, endpoint, req.doc_id, req.topic, _semantic_params(req), content)
+
+
+def _llm_http_error(error: LLMError) -> HTTPException:
+    """429 when the LLM quota is exhausted, 503 when the provider is failing."""
+    status_code = 429 if isinstance(error, LLMRateLimitError) else 503
+    headers = {"Retry-After": str(max(1, int(error.retry_after + 0.999)))} if error.retry_after else None
+    return HTTPException(status_code=status_code, detail=str(error), headers=headers)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _single_piece(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _stream_summary(
+    pieces: AsyncIterator[str],
+    meta: Dict[str, Any],
+    started: float,
+    retrieval_ms: float
+) -> AsyncIterator[str]:
+    """SSE body: a ``meta`` event, one ``token`` event per piece, then ``done`` with timings."""
+    yield _sse("meta", meta)
+
+    first_token_ms = None
+    characters = 0
+    try:
+        async for piece in pieces:
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            characters += len(piece)
+            yield _sse("token", {"text": piece})
+    except LLMError as e:
+        logger.warning(f"LLM unavailable while streaming summary: {str(e)}")
+        http_error = _llm_http_error(e)
+        yield _sse("error", {"status": http_error.status_code, "detail": http_error.detail})
+    except Exception as e:
+        logger.error(f"Error while streaming summary: {str(e)}", exc_info=True)
+        yield _sse("error", {"status": 500, "detail": f"Error: {str(e)}"})
+
+    yield _sse("done", {
+        "retrieval_ms": round(retrieval_ms, 1),
+        "first_token_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "characters": characters
+    })
+
+
+def _event_stream(body: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/upload")
-async def upload_document(file: UploadFile):
+async def upload_document(file: UploadFile, document_name: Optional[str] = Form(None)):
+    """Upload a document for ingestion.
+
+    Give ``document_name`` to replace an earlier upload under the same name;
+    only chunks that changed are re-embedded.
+    """
     try:
         logger.info(f"Starting upload for file: {file.filename}")
 
-        # Generate unique filename
+        # Stream to a temporary file, hashing the content as it arrives
         file_ext = Path(file.filename).suffix
-        file_id = f"{uuid.uuid4()}{file_ext}"
-        file_path = os.path.join(UPLOAD_FOLDER, file_id)
-
-        # Save file
-        content = await file.read()
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
-        logger.info(f"File saved to {file_path}")
-
-        # Process document
-        processor = DocumentProcessor()
-        chunks = processor.process_document(file_path)
-        logger.info(f"Processed document into {len(chunks)} chunks")
-
-        if not chunks:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No text could be extracted from this file.",
+        temp_path = os.path.join(UPLOAD_FOLDER, f".{uuid.uuid4()}.part")
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as buffer:
+                while True:
+                    piece = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                    if not piece:
+                        break
+                    hasher.update(piece)
+                    buffer.write(piece)
+                    size += len(piece)
+        except BaseException:
+            # Disconnects and disk errors must not leave partial files behind
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        # The content hash is the stable document id and the stored filename
+        doc_id = hasher.hexdigest()
+        file_path = os.path.join(UPLOAD_FOLDER, f"{doc_id}{file_ext}")
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, file_path)
+        logger.info(f"File saved to {file_path} ({size} bytes)")
+
+        # A running job has written only part of the document so far
+        active = get_ingestion_queue().get_active(doc_id)
+        if active:
+            logger.info(f"Document {doc_id} is already being ingested by job {active.id}")
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "success": True,
+                    "id": doc_id,
+                    "job_id": active.id,
+                    "filename": file.filename,
+                    "size": size,
+                    "status": active.status,
+                    "duplicate": True,
+                    "message": "Document is already being ingested"
+                }
             )
 
-        # Add to LangChain RAG
+        # Failed jobs remove what they wrote, so stored chunks mean a completed ingest
         from rag_singleton import get_rag_service
-        rag_service = get_rag_service()
-        
-        success = rag_service.add_documents(chunks)
-        if success:
-            logger.info(f"Document added successfully to LangChain ChromaDB")
-        else:
-            raise HTTPException(status_code=500, detail="Failed to add document to ChromaDB")
+        rag_service = await run_blocking(get_rag_service)
+        existing_chunks = await run_blocking(rag_service.get_document_chunk_count, doc_id)
+        if existing_chunks:
+            logger.info(f"Document {doc_id} already indexed with {existing_chunks} chunks")
+            if document_name:
+                # Same content, possibly a new name: the name now means this document
+                linked = await run_blocking(rag_service.link_document_name, document_name, doc_id)
+                if linked is None:
+                    raise RuntimeError(f"Failed to link '{document_name}' to document {doc_id}")
+                await _drop_summaries(linked["replaced_document_ids"])
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "success": True,
+                    "id": doc_id,
+                    "job_id": None,
+                    "filename": file.filename,
+                    "size": size,
+                    "chunks": existing_chunks,
+                    "status": "completed",
+                    "duplicate": True,
+                    "message": "Document already stored in ChromaDB"
+                }
+            )
+
+        # Parse, embed and store in the background
+        job = get_ingestion_queue().submit(
+            document_id=doc_id,
+            filename=file.filename,
+            file_path=file_path,
+            size=size,
+            document_name=document_name,
+        )
 
         return JSONResponse(
-            status_code=200,
+            status_code=202,
             content={
                 "success": True,
-                "id": file_id,
+                "id": doc_id,
+                "job_id": job.id,
                 "filename": file.filename,
-                "size": len(content),
-                "chunks": len(chunks),
-                "message": "Document uploaded and stored in ChromaDB successfully"
+                "size": size,
+                "status": job.status,
+                "duplicate": False,
+                "message": "Document uploaded and queued for ingestion"
             }
         )
 
@@ -100,176 +372,388 @@ async def upload_document(file: UploadFile):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    job = get_ingestion_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    return JSONResponse(status_code=200, content=job.model_dump())
+
+
 @router.post("/summarize")
 async def summarize_document(req: SummarizeRequest):
     try:
-        from rag_singleton import get_rag_service
-        rag_service = get_rag_service()
-
-        query = "Generate a comprehensive summary of document content."
-        logger.info(f"Searching for relevant chunks with query: {query}")
-        
-        results = rag_service.search(query, k=10)
-        logger.info(f"Found {len(results)} relevant chunks")
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="No relevant content found for summarization")
-        
-        context = "\n\n".join([r["text"] for r in results])
-        prompt = f"""Please generate a {req.length} summary of following document in a {req.style} style:
+        # Identical requests arriving while one is running share its result
+        content = await generation_flights.do(
+            request_key("summarize", req.model_dump()), lambda: _summarize(req)
+        )
+        return JSONResponse(status_code=200, content=content)
 
-{context}
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
+    except Exception as e:
+        logger.error(f"Error in summarize: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
-Summary:"""
 
-        summary = rag_service.generate(prompt)
+async def _summarize(req: SummarizeRequest) -> Dict[str, Any]:
+    from rag_singleton import get_rag_service
+    rag_service = await run_blocking(get_rag_service)
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "summary": summary,
-                "chunks_used": len(results),
+    # Served from the ingest-time summary, restyled from its sections if needed
+    stored = await _stored_summary(req)
+    if stored:
+        restyle_prompt = _restyle_prompt(stored, req)
+        if restyle_prompt is None:
+            summary = stored["summary"]
+        else:
+            summary = await rag_service.agenerate(restyle_prompt, **req.cache_kwargs())
+        return {
+            "success": True,
+            "summary": summary,
+            "chunks_used": stored["chunks"],
+            "style": req.style,
+            "length": req.length,
+            "retrieval_method": "precomputed" if restyle_prompt is None else "precomputed_restyled",
+            "document_scoped": True
+        }
+
+    if req.mode == "map_reduce":
+        result = await _map_reduce_summarizer(rag_service).asummarize(
+            req.doc_id, req.style, req.length, concurrency=settings.SUMMARY_CONCURRENCY
+        )
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"No chunks stored for document: {req.doc_id}")
+        await _replace_stored_summary(req, result["summary"], result["sections"], result["chunks"])
+        return {
+            "success": True,
+            "summary": result["summary"],
+            "chunks_used": result["chunks"],
+            "sections": len(result["sections"]),
+            "style": req.style,
+            "length": req.length,
+            "retrieval_method": "map_reduce",
+            "document_scoped": True
+        }
+
+    query = "Generate a comprehensive summary of document content."
+    logger.info(f"Searching for relevant chunks with query: {query}")
+    
+    filters = await _document_scope(rag_service, req.doc_id)
+    results = await rag_service.asearch(query, k=10, filters=filters)
+    logger.info(f"Found {len(results)} relevant chunks")
+    
+    if not results:
+        raise HTTPException(status_code=404, detail="No relevant content found for summarization")
+    
+    prompt = _summary_prompt(req, results)
+
+    summary = await rag_service.agenerate(prompt, **req.cache_kwargs())
+    await _replace_stored_summary(req)
+
+    return {
+        "success": True,
+        "summary": summary,
+        "chunks_used": len(results),
+        "style": req.style,
+        "length": req.length,
+        "retrieval_method": "semantic_search",
+        "document_scoped": filters is not None
+    }
+
+
+@router.post("/summarize/stream")
+async def summarize_document_stream(req: SummarizeRequest):
+    """Streaming /summarize: Server-Sent Events with tokens as the LLM produces them."""
+    started = time.perf_counter()
+    try:
+        from rag_singleton import get_rag_service
+        rag_service = await run_blocking(get_rag_service)
+
+        stored = await _stored_summary(req)
+        if stored:
+            restyle_prompt = _restyle_prompt(stored, req)
+            meta = {
+                "chunks_used": stored["chunks"],
                 "style": req.style,
                 "length": req.length,
-                "retrieval_method": "semantic_search"
+                "retrieval_method": "precomputed" if restyle_prompt is None else "precomputed_restyled",
+                "document_scoped": True
             }
-        )
+            pieces = (
+                _single_piece(stored["summary"]) if restyle_prompt is None
+                else rag_service.astream(restyle_prompt, **req.cache_kwargs())
+            )
+            return _event_stream(
+                _stream_summary(pieces, meta, started, (time.perf_counter() - started) * 1000)
+            )
 
+        if req.mode == "map_reduce":
+            # Map stages run before the stream opens; the final reduce is streamed
+            summarizer = _map_reduce_summarizer(rag_service)
+            prepared = await summarizer.aprepare_sections(req.doc_id, concurrency=settings.SUMMARY_CONCURRENCY)
+            if prepared is None:
+                raise HTTPException(status_code=404, detail=f"No chunks stored for document: {req.doc_id}")
+            sections, chunk_count = prepared
+            meta = {
+                "chunks_used": chunk_count,
+                "sections": len(sections),
+                "style": req.style,
+                "length": req.length,
+                "retrieval_method": "map_reduce",
+                "document_scoped": True
+            }
+            pieces = rag_service.astream(
+                summarizer.document_prompt(sections, req.style, req.length), **req.cache_kwargs()
+            )
+            if req.refresh_cache:
+                pieces = _storing_summary(pieces, req, sections, chunk_count)
+            return _event_stream(
+                _stream_summary(pieces, meta, started, (time.perf_counter() - started) * 1000)
+            )
+
+        filters = await _document_scope(rag_service, req.doc_id)
+        results = await rag_service.asearch(
+            "Generate a comprehensive summary of document content.", k=10, filters=filters
+        )
+        await _replace_stored_summary(req)
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
-        logger.error(f"Error in summarize: {str(e)}", exc_info=True)
+        logger.error(f"Error in summarize stream: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+    if not results:
+        raise HTTPException(status_code=404, detail="No relevant content found for summarization")
+
+    meta = {
+        "chunks_used": len(results),
+        "style": req.style,
+        "length": req.length,
+        "retrieval_method": "semantic_search",
+        "document_scoped": filters is not None
+    }
+    retrieval_ms = (time.perf_counter() - started) * 1000
+    return _event_stream(
+        _stream_summary(
+            rag_service.astream(_summary_prompt(req, results), **req.cache_kwargs()),
+            meta, started, retrieval_ms
+        )
+    )
+
 
 @router.post("/topic-summary")
 async def generate_topic_summary(req: TopicSummarizeRequest):
     try:
-        from rag_singleton import get_rag_service
-        rag_service = get_rag_service()
-
-        # Use topic as search query for targeted content retrieval
-        query = f"Find information about {req.topic} in document"
-        logger.info(f"Searching for topic-specific content: {req.topic}")
-        
-        results = rag_service.search(query, k=8)
-        logger.info(f"Found {len(results)} relevant chunks for topic: {req.topic}")
-        
-        if not results:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"No relevant content found for topic: {req.topic}"
-            )
-        
-        # Extract topic-specific content
-        context = "\n\n".join([r["text"] for r in results])
-        
-        # Generate focused summary for specific topic
-        prompt = f"""Please generate a {req.length} summary focused specifically on "{req.topic}" from the following document content. 
-Only summarize information related to {req.topic}. Ignore other topics. Use a {req.style} style.
-
-Document Content:
-{context}
+        content = await generation_flights.do(
+            request_key("topic-summary", req.model_dump()), lambda: _topic_summary(req)
+        )
+        return JSONResponse(status_code=200, content=content)
 
-Topic-Specific Summary:"""
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
+    except Exception as e:
+        logger.error(f"Error in topic summary: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
-        summary = rag_service.generate(prompt)
 
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "summary": summary,
-                "topic": req.topic,
-                "chunks_used": len(results),
-                "style": req.style,
-                "length": req.length,
-                "retrieval_method": "topic_semantic_search"
-            }
+async def _topic_summary(req: TopicSummarizeRequest) -> Dict[str, Any]:
+    from rag_singleton import get_rag_service
+    rag_service = await run_blocking(get_rag_service)
+
+    cached = await _semantic_lookup(rag_service, "topic-summary", req)
+    if cached:
+        return cached
+
+    # Use topic as search query for targeted content retrieval
+    query = f"Find information about {req.topic} in document"
+    logger.info(f"Searching for topic-specific content: {req.topic}")
+    
+    filters = await _document_scope(rag_service, req.doc_id)
+    results = await rag_service.asearch(query, k=8, filters=filters)
+    logger.info(f"Found {len(results)} relevant chunks for topic: {req.topic}")
+    
+    if not results:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No relevant content found for topic: {req.topic}"
         )
-
+    
+    prompt = _topic_summary_prompt(req, results)
+
+    summary = await rag_service.agenerate(prompt, **req.cache_kwargs())
+
+    content = {
+        "success": True,
+        "summary": summary,
+        "topic": req.topic,
+        "chunks_used": len(results),
+        "style": req.style,
+        "length": req.length,
+        "retrieval_method": "topic_semantic_search",
+        "document_scoped": filters is not None
+    }
+    await _semantic_store(rag_service, "topic-summary", req, content)
+    return content
+
+
+@router.post("/topic-summary/stream")
+async def generate_topic_summary_stream(req: TopicSummarizeRequest):
+    """Streaming /topic-summary: Server-Sent Events with tokens as the LLM produces them."""
+    started = time.perf_counter()
+    try:
+        from rag_singleton import get_rag_service
+        rag_service = await run_blocking(get_rag_service)
+        filters = await _document_scope(rag_service, req.doc_id)
+        results = await rag_service.asearch(
+            f"Find information about {req.topic} in document", k=8, filters=filters
+        )
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
-        logger.error(f"Error in topic summary: {str(e)}", exc_info=True)
+        logger.error(f"Error in topic summary stream: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+    if not results:
+        raise HTTPException(status_code=404, detail=f"No relevant content found for topic: {req.topic}")
+
+    meta = {
+        "topic": req.topic,
+        "chunks_used": len(results),
+        "style": req.style,
+        "length": req.length,
+        "retrieval_method": "topic_semantic_search",
+        "document_scoped": filters is not None
+    }
+    retrieval_ms = (time.perf_counter() - started) * 1000
+    return _event_stream(
+        _stream_summary(
+            rag_service.astream(_topic_summary_prompt(req, results), **req.cache_kwargs()),
+            meta, started, retrieval_ms
+        )
+    )
+
 
 @router.post("/generate-qa")
 async def generate_qa_pairs(req: QAGenerateRequest):
     try:
-        from rag_singleton import get_rag_service
-        rag_service = get_rag_service()
-        
-        # Import Q&A generator
-        from app.services.academic.qa_generator import QAGenerator
-        qa_generator = QAGenerator(rag_service)
-        
-        # Generate Q&A pairs
-        result = qa_generator.generate_qa_pairs(
-            topic=req.topic,
-            num_questions=req.num_questions,
-            question_types=req.question_types,
-            difficulty_levels=req.difficulty_levels
+        content = await generation_flights.do(
+            request_key("generate-qa", req.model_dump()), lambda: _generate_qa_pairs(req)
         )
-        
-        if result["success"]:
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "success": True,
-                    "qa_pairs": result["qa_pairs"],
-                    "topic": req.topic,
-                    "total_questions": result["total_questions"],
-                    "difficulty_distribution": result["difficulty_distribution"],
-                    "topics_covered": result["topics_covered"],
-                    "source_chunks_used": result["source_chunks_used"]
-                }
-            )
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=result.get("error", "Failed to generate Q&A pairs")
-            )
-            
+        return JSONResponse(status_code=200, content=content)
+
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
         logger.error(f"Error in Q&A generation: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+
+async def _generate_qa_pairs(req: QAGenerateRequest) -> Dict[str, Any]:
+    from rag_singleton import get_rag_service
+    rag_service = await run_blocking(get_rag_service)
+
+    cached = await _semantic_lookup(rag_service, "generate-qa", req)
+    if cached:
+        return cached
+    
+    # Import Q&A generator
+    from app.services.academic.qa_generator import QAGenerator
+    qa_generator = QAGenerator(rag_service)
+    
+    # Generate Q&A pairs
+    result = await qa_generator.agenerate_qa_pairs(
+        topic=req.topic,
+        filters=await _document_scope(rag_service, req.doc_id),
+        num_questions=req.num_questions,
+        question_types=req.question_types,
+        difficulty_levels=req.difficulty_levels,
+        **req.cache_kwargs()
+    )
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=400,
+            detail=result.get("error", "Failed to generate Q&A pairs")
+        )
+
+    content = {
+        "success": True,
+        "qa_pairs": result["qa_pairs"],
+        "topic": req.topic,
+        "total_questions": result["total_questions"],
+        "difficulty_distribution": result["difficulty_distribution"],
+        "topics_covered": result["topics_covered"],
+        "source_chunks_used": result["source_chunks_used"]
+    }
+    await _semantic_store(rag_service, "generate-qa", req, content)
+    return content
+
+
 @router.post("/generate-flashcards")
 async def generate_flashcards(req: FlashcardGenerateRequest):
     try:
-        from rag_singleton import get_rag_service
-        rag_service = get_rag_service()
-        
-        # Import flashcard generator
-        from app.services.academic.flashcard_generator import FlashcardGenerator
-        flashcard_generator = FlashcardGenerator(rag_service)
-        
-        # Generate flashcards
-        result = flashcard_generator.generate_flashcards(
-            topic=req.topic,
-            num_cards=req.num_cards,
-            difficulty=req.difficulty,
-            card_types=req.card_types
+        content = await generation_flights.do(
+            request_key("generate-flashcards", req.model_dump()), lambda: _generate_flashcards(req)
         )
-        
-        if result["success"]:
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "success": True,
-                    "flashcards": result["flashcards"],
-                    "topic": req.topic,
-                    "total_cards": result["total_cards"],
-                    "difficulty_level": result["difficulty_level"],
-                    "card_types_used": result["card_types_used"],
-                    "source_chunks_used": result["source_chunks_used"]
-                }
-            )
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=result.get("error", "Failed to generate flashcards")
-            )
-            
+        return JSONResponse(status_code=200, content=content)
+
+    except HTTPException:
+        raise
+    except LLMError as e:
+        raise _llm_http_error(e)
     except Exception as e:
         logger.error(f"Error in flashcard generation: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+async def _generate_flashcards(req: FlashcardGenerateRequest) -> Dict[str, Any]:
+    from rag_singleton import get_rag_service
+    rag_service = await run_blocking(get_rag_service)
+
+    cached = await _semantic_lookup(rag_service, "generate-flashcards", req)
+    if cached:
+        return cached
+    
+    # Import flashcard generator
+    from app.services.academic.flashcard_generator import FlashcardGenerator
+    flashcard_generator = FlashcardGenerator(rag_service)
+    
+    # Generate flashcards
+    result = await flashcard_generator.agenerate_flashcards(
+        topic=req.topic,
+        filters=await _document_scope(rag_service, req.doc_id),
+        num_cards=req.num_cards,
+        difficulty=req.difficulty,
+        card_types=req.card_types,
+        **req.cache_kwargs()
+    )
+    
+    if not result["success"]:
+        raise HTTPException(
+            status_code=400,
+            detail=result.get("error", "Failed to generate flashcards")
+        )
+
+    content = {
+        "success": True,
+        "flashcards": result["flashcards"],
+        "topic": req.topic,
+        "total_cards": result["total_cards"],
+        "difficulty_level": result["difficulty_level"],
+        "card_types_used": result["card_types_used"],
+        "source_chunks_used": result["source_chunks_used"]
+    }
+    await _semantic_store(rag_service, "generate-flashcards", req, content)
+    return content
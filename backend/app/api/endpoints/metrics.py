@@ -0,0 +1,48 @@
+# backend/app/api/endpoints/metrics.py
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+
+from app.services import metrics
+
+router = APIRouter()
+
+
+def _route_template(request: Request) -> str:
+    """The matched route's path (e.g. /api/documents/jobs/{job_id}), so
+    metric labels do not grow with every id."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+
+async def track_requests(request: Request, call_next):
+    """HTTP middleware: attribute stage metrics to the route and time the request.
+
+    For streaming responses the "request" stage ends when the response starts;
+    the LLM part is covered by the "llm_stream" stage.
+    """
+    endpoint = _route_template(request)
+    with metrics.endpoint_context(endpoint):
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        except Exception as e:
+            metrics.record_error("request", e)
+            raise
+        finally:
+            metrics.STAGE_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, stage="request")
+            metrics.REQUESTS.inc(endpoint=endpoint, method=request.method, status=str(status))
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-endpoint stage latencies, LLM payload sizes, cache lookups and errors"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -14,4 +16,81 @@ class Settings(BaseSettings):
     # Keep this so your app will NOT crash even if MODEL_NAME exists in .env or Windows env vars
     MODEL_NAME: str = "models/gemini-2.5-flash"
 
+    # Uploads are streamed to disk in pieces of this many bytes
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # Number of background threads running ingestion jobs
+    INGEST_WORKERS: int = 1
+    # Threads available to async endpoints for blocking vector and parsing work
+    BLOCKING_POOL_SIZE: int = 16
+    # Processes used to extract PDF pages in parallel (1 = in-process)
+    PDF_EXTRACT_WORKERS: int = 4
+    # Chunks embedded and written to the vector store per batch
+    INGEST_BATCH_SIZE: int = 64
+
+    # Embedding runtime: torch, torch-int8, onnx or onnx-int8 (see embedding_backends)
+    EMBEDDING_BACKEND: str = "torch"
+    # Quantized ONNX graph to load for onnx-int8; defaults to the AVX2 build
+    EMBEDDING_ONNX_FILE: Optional[str] = None
+
+    # On-disk embedding cache shared by every embedding model
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = "./embedding_cache"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000
+
+    # Concurrent query embeddings are collected into one batched encode call
+    QUERY_BATCHING_ENABLED: bool = True
+    QUERY_BATCH_MAX_SIZE: int = 32
+    QUERY_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # In-process LRU of query vectors and search results, invalidated on ingest.
+    # Set RETRIEVAL_CACHE_SHARED_PATH to share it across workers via SQLite.
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = 1024
+    RETRIEVAL_CACHE_SHARED_PATH: Optional[str] = None
+
+    # Opt-in SQLite cache of LLM completions keyed by model, temperature and prompt
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_PATH: str = "./llm_cache/responses.sqlite3"
+    LLM_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Opt-in reuse of topic-level results (Q&A, flashcards, topic summaries) for
+    # topics whose embeddings are at least this cosine-similar on the same document
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 512
+
+    # Build a chunk group -> section -> document summary after each ingest,
+    # served by /summarize without retrieval
+    PRECOMPUTE_SUMMARIES: bool = False
+    SUMMARY_STORE_PATH: str = "./summaries/summaries.sqlite3"
+    SUMMARY_GROUP_SIZE: int = 8
+    SUMMARY_SECTION_SIZE: int = 5
+    # Group/section summaries generated at once (ingest and /summarize map_reduce mode)
+    SUMMARY_CONCURRENCY: int = 4
+
+    # Quota-aware LLM client: request/token budgets per minute (0 = unlimited),
+    # concurrent calls, jittered exponential backoff and a circuit breaker
+    LLM_REQUESTS_PER_MINUTE: int = 60
+    LLM_TOKENS_PER_MINUTE: int = 1_000_000
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE_SECONDS: float = 1.0
+    LLM_BACKOFF_MAX_SECONDS: float = 30.0
+    # Calls that would wait longer than this for the budget fail with 429 instead
+    LLM_MAX_QUEUE_SECONDS: float = 30.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Chat model behind LangChainRAG: "gemini", or "fake" for a local model with
+    # canned answers for load tests (latency before the first token, then tokens/s)
+    LLM_PROVIDER: str = "gemini"
+    FAKE_LLM_LATENCY_SECONDS: float = 0.3
+    FAKE_LLM_TOKENS_PER_SECOND: float = 80.0
+    # "record" saves every prompt -> response with its timing to LLM_RECORDINGS_PATH,
+    # "replay" serves them from there without calling the model (speed scales delays)
+    LLM_RECORD_REPLAY_MODE: Optional[str] = None
+    LLM_RECORDINGS_PATH: str = "./llm_recordings/recordings.jsonl"
+    LLM_REPLAY_SPEED: float = 1.0
+
 settings = Settings()
\ No newline at end of file
@@ -1,18 +1,36 @@
+from contextlib import asynccontextmanager
+import asyncio
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import documents
+from fastapi.responses import JSONResponse
+from app.api.endpoints import documents, metrics
 from app.config import settings
+from rag_singleton import (
+    get_rag_service as get_shared_rag_service,
+    get_warmup_error,
+    is_rag_service_ready,
+    warmup_rag_service,
+)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /ready can answer 503 until it finishes
+    warmup_task = asyncio.create_task(asyncio.to_thread(warmup_rag_service))
+    yield
+    warmup_task.cancel()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Teaching Assistant",
     description="Generative AI Agent for Automated Teaching Content Creation using RAG",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -26,33 +44,32 @@ app.add_middleware(
 
 # Include routers
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
+app.include_router(metrics.router, tags=["metrics"])
+
+# Label stage metrics with the route being served
+app.middleware("http")(metrics.track_requests)
 
 # Global RAG service instances for backward compatibility
 _custom_rag_service = None
-_langchain_rag_service = None
+_custom_rag_service_lock = threading.Lock()
 
 def get_rag_service(provider: str = "chroma_gemini"):
     """Get RAG service instance with provider selection"""
-    global _custom_rag_service, _langchain_rag_service
+    global _custom_rag_service
     
     if provider == "langchain":
-        if _langchain_rag_service is None:
-            from app.services.rag import RAGFactory
-            _langchain_rag_service = RAGFactory.create_rag_service(
-                provider="langchain",
-                api_key=settings.GEMINI_API_KEY
-            )
-            logger.info("Created LangChain RAG service")
-        return _langchain_rag_service
+        # Shared with the endpoints and warmed up by the lifespan hook
+        return get_shared_rag_service()
     
     else:  # Default to custom
-        if _custom_rag_service is None:
-            from app.services.rag import RAGFactory
-            _custom_rag_service = RAGFactory.create_rag_service(
-                provider="chroma_gemini",
-                api_key=settings.GEMINI_API_KEY
-            )
-            logger.info("Created custom RAG service")
+        with _custom_rag_service_lock:
+            if _custom_rag_service is None:
+                from app.services.rag import RAGFactory
+                _custom_rag_service = RAGFactory.create_rag_service(
+                    provider="chroma_gemini",
+                    api_key=settings.GEMINI_API_KEY
+                )
+                logger.info("Created custom RAG service")
         return _custom_rag_service
 
 @app.get("/")
@@ -63,6 +80,17 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "AI Teaching Assistant"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Report 503 until the RAG service is built and warmed up"""
+    if not is_rag_service_ready():
+        error = get_warmup_error()
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed" if error else "warming_up", "error": error}
+        )
+    return {"status": "ready"}
+
 @app.get("/api/rag-status")
 async def rag_status():
     """Get status of both RAG services"""
@@ -85,9 +113,14 @@ async def rag_status():
         else:
             langchain_stats = {"status": "available", "type": "langchain"}
         
+        from app.services.model_registry import model_registry
+        from app.services.single_flight import generation_flights
+
         return {
             "custom_rag": custom_stats,
             "langchain_rag": langchain_stats,
+            "embedding_models": model_registry.memory_report(),
+            "request_coalescing": generation_flights.stats(),
             "status": "both_services_available"
         }
         
@@ -0,0 +1,27 @@
+# backend/app/models/job.py
+from pydantic import BaseModel
+from typing import Optional
+
+
+class IngestionJob(BaseModel):
+    id: str
+    document_id: str
+    filename: str
+    file_path: str
+    size: int = 0
+    # Set for uploads that replace an earlier version of the same document
+    document_name: Optional[str] = None
+    # queued -> processing -> completed | failed
+    status: str = "queued"
+    pages_parsed: int = 0
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    chunks_written: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    error: Optional[str] = None
+    # Set when PRECOMPUTE_SUMMARIES is on: queued -> processing -> completed | failed | skipped
+    summary_status: Optional[str] = None
+    summary_error: Optional[str] = None
+    created_at: float
+    updated_at: float
@@ -0,0 +1,169 @@
+# backend/app/services/academic/document_summarizer.py
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.services.batching import iter_batches
+from app.services.executor import run_blocking
+
+if TYPE_CHECKING:
+    from app.services.rag.langchain_rag import LangChainRAG
+
+logger = logging.getLogger(__name__)
+
+# Style and length of the summary built at ingest time
+DEFAULT_STYLE = "concise"
+DEFAULT_LENGTH = "medium"
+
+
+class DocumentSummarizer:
+    """Builds a hierarchical summary of a stored document.
+
+    Consecutive chunks (in ``chunk_index`` order) are summarized in groups,
+    group summaries are merged into section summaries, and the sections into
+    one document summary. Every chunk of the document is read, not just the
+    best search hits; the map stages can run concurrently.
+    """
+
+    def __init__(self, rag_service: "LangChainRAG", group_size: int = 8, section_size: int = 5):
+        self.rag_service = rag_service
+        self.group_size = max(1, group_size)
+        self.section_size = max(2, section_size)
+        logger.info("Initialized DocumentSummarizer")
+
+    def summarize(
+        self,
+        document_id: str,
+        style: str = DEFAULT_STYLE,
+        length: str = DEFAULT_LENGTH,
+        concurrency: int = 1,
+    ) -> Optional[Dict[str, Any]]:
+        """Return {"summary", "sections", "chunks", "style", "length"}, or None
+        if the document has no stored chunks. LLM failures raise.
+
+        Up to ``concurrency`` group or section summaries are generated at once.
+        """
+        chunks = self.rag_service.get_document_chunks(document_id)
+        if not chunks:
+            return None
+
+        logger.info(f"Summarizing document {document_id} from {len(chunks)} chunks")
+        sections = self._map(self._group_prompt, list(iter_batches(chunks, self.group_size)), concurrency)
+        # Long documents get as many section levels as it takes
+        while len(sections) > self.section_size:
+            sections = self._map(
+                self._section_prompt, list(iter_batches(sections, self.section_size)), concurrency
+            )
+
+        return {
+            "summary": self._generate(self.document_prompt(sections, style, length)),
+            "sections": sections,
+            "chunks": len(chunks),
+            "style": style,
+            "length": length,
+        }
+
+    async def asummarize(
+        self,
+        document_id: str,
+        style: str = DEFAULT_STYLE,
+        length: str = DEFAULT_LENGTH,
+        concurrency: int = 4,
+    ) -> Optional[Dict[str, Any]]:
+        """Async map-reduce variant of ``summarize``: groups are summarized
+        concurrently, at most ``concurrency`` LLM calls in flight."""
+        prepared = await self.aprepare_sections(document_id, concurrency)
+        if prepared is None:
+            return None
+
+        sections, chunk_count = prepared
+        summary = await self.rag_service.agenerate(
+            self.document_prompt(sections, style, length), raise_errors=True
+        )
+        return {
+            "summary": summary,
+            "sections": sections,
+            "chunks": chunk_count,
+            "style": style,
+            "length": length,
+        }
+
+    async def aprepare_sections(
+        self, document_id: str, concurrency: int = 4
+    ) -> Optional[Tuple[List[str], int]]:
+        """Run the map stages: return (section summaries, chunk count), or None
+        if the document has no stored chunks. Callers do the final reduce,
+        e.g. by streaming ``document_prompt``."""
+        chunks = await run_blocking(self.rag_service.get_document_chunks, document_id)
+        if not chunks:
+            return None
+
+        logger.info(f"Map-reduce summarizing document {document_id} from {len(chunks)} chunks")
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self.rag_service.agenerate(prompt, raise_errors=True)
+
+        async def amap(build_prompt, batches: List[List[str]]) -> List[str]:
+            tasks = [asyncio.ensure_future(generate(build_prompt(batch))) for batch in batches]
+            try:
+                return list(await asyncio.gather(*tasks))
+            finally:
+                # One failed call fails the summary; stop spending quota on the rest
+                for task in tasks:
+                    task.cancel()
+
+        sections = await amap(self._group_prompt, list(iter_batches(chunks, self.group_size)))
+        while len(sections) > self.section_size:
+            sections = await amap(self._section_prompt, list(iter_batches(sections, self.section_size)))
+        return sections, len(chunks)
+
+    def _map(self, build_prompt, batches: List[List[str]], concurrency: int) -> List[str]:
+        prompts = [build_prompt(batch) for batch in batches]
+        if concurrency <= 1 or len(prompts) <= 1:
+            return [self._generate(prompt) for prompt in prompts]
+        # Each call gets its own copy of our context (e.g. the metrics endpoint)
+        contexts = [contextvars.copy_context() for _ in prompts]
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, len(prompts)), thread_name_prefix="summarize-map"
+        ) as pool:
+            try:
+                return list(pool.map(lambda context, prompt: context.run(self._generate, prompt), contexts, prompts))
+            except BaseException:
+                # Do not start the queued calls once the summary has failed
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    def _generate(self, prompt: str) -> str:
+        return self.rag_service.generate(prompt, raise_errors=True)
+
+    @staticmethod
+    def _group_prompt(chunks: List[str]) -> str:
+        passage = "\n\n".join(chunks)
+        return f"""Summarize the following consecutive passage of a document. Keep every key concept, definition and result; omit nothing important.
+
+{passage}
+
+Passage Summary:"""
+
+    @staticmethod
+    def _section_prompt(summaries: List[str]) -> str:
+        parts = "\n\n".join(summaries)
+        return f"""The following are summaries of consecutive parts of one section of a document. Merge them into a single coherent section summary.
+
+{parts}
+
+Section Summary:"""
+
+    @staticmethod
+    def document_prompt(sections: List[str], style: str, length: str) -> str:
+        """Prompt turning section summaries into a document summary; also used to restyle"""
+        parts = "\n\n".join(sections)
+        return f"""Please generate a {length} summary of the whole document in a {style} style, based on these summaries of its sections in order:
+
+{parts}
+
+Summary:"""
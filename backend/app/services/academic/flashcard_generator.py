@@ -1,14 +1,19 @@
 # backend/app/services/academic/flashcard_generator.py
 
 import logging
-from typing import List, Dict, Any, Optional
-from app.services.rag.langchain_rag import LangChainRAG
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+from app.services.executor import run_blocking
+from app.services.metrics import stage
+
+if TYPE_CHECKING:
+    from app.services.rag.langchain_rag import LangChainRAG
 
 logger = logging.getLogger(__name__)
 
 
 class FlashcardGenerator:
-    def __init__(self, rag_service: LangChainRAG):
+    def __init__(self, rag_service: "LangChainRAG"):
         self.rag_service = rag_service
         logger.info("Initialized FlashcardGenerator")
 
@@ -17,16 +22,61 @@ class FlashcardGenerator:
         topic: str,
         num_cards: int = 10,
         difficulty: str = "medium",
-        card_types: Optional[List[str]] = None
+        card_types: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **generate_kwargs
     ) -> Dict[str, Any]:
         """
         Generate flashcards for a specific topic from document content.
+        ``filters`` restricts retrieval (see ``document_filter``); extra keyword
+        arguments (e.g. ``use_cache``) go to the RAG service's generate.
+        """
+        if card_types is None:
+            card_types = ["definition", "concept", "application"]
+
+        logger.info(f"Generating {num_cards} flashcards for topic: {topic}")
+
+        results = self._search_context(topic, filters)
+        if not results:
+            return self._no_content_result(topic)
+
+        with stage("prompt"):
+            prompt = self._build_prompt(topic, num_cards, results)
+        response = self.rag_service.generate(prompt, **generate_kwargs)
+        with stage("parse_response"):
+            return self._build_result(response, results, topic, num_cards, difficulty, card_types)
+
+    async def agenerate_flashcards(
+        self,
+        topic: str,
+        num_cards: int = 10,
+        difficulty: str = "medium",
+        card_types: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **generate_kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of generate_flashcards: retrieval runs on the bounded
+        pool and generation uses the LLM's async invoke.
         """
         if card_types is None:
             card_types = ["definition", "concept", "application"]
 
         logger.info(f"Generating {num_cards} flashcards for topic: {topic}")
 
+        results = await run_blocking(self._search_context, topic, filters)
+        if not results:
+            return self._no_content_result(topic)
+
+        with stage("prompt"):
+            prompt = self._build_prompt(topic, num_cards, results)
+        response = await self.rag_service.agenerate(prompt, **generate_kwargs)
+        with stage("parse_response"):
+            return self._build_result(response, results, topic, num_cards, difficulty, card_types)
+
+    def _search_context(
+        self, topic: str, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         # ------------------ SEARCH PHASE ------------------
         search_queries = [
             f"{topic} definitions concepts",
@@ -35,34 +85,21 @@ class FlashcardGenerator:
             f"{topic} important principles"
         ]
 
-        all_results = []
-        for query in search_queries:
-            results = self.rag_service.search(query, k=5)
-            all_results.extend(results)
-
-        # ------------------ REMOVE DUPLICATES ------------------
-        unique_results = []
-        seen_texts = set()
+        # One batched lookup; chunks found by several queries are merged
+        return self.rag_service.search_many(search_queries, k=5, filters=filters, limit=15)
 
-        for result in all_results:
-            text = result.get("text", "").strip()
-            if text and text not in seen_texts:
-                unique_results.append(result)
-                seen_texts.add(text)
-
-        results = unique_results[:15]
-
-        if not results:
-            return {
-                "success": False,
-                "error": f"No relevant content found for topic: {topic}",
-                "flashcards": []
-            }
+    def _no_content_result(self, topic: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"No relevant content found for topic: {topic}",
+            "flashcards": []
+        }
 
+    def _build_prompt(self, topic: str, num_cards: int, results: List[Dict[str, Any]]) -> str:
         # ------------------ CONTEXT ------------------
         context = "\n\n".join(r["text"] for r in results)
 
-        prompt = f"""
+        return f"""
 Create {num_cards} flashcards about {topic} based on the context below.
 
 Context:
@@ -76,8 +113,15 @@ Type:
 Repeat this format {num_cards} times.
 """
 
-        # ------------------ GENERATION ------------------
-        response = self.rag_service.generate(prompt)
+    def _build_result(
+        self,
+        response: str,
+        results: List[Dict[str, Any]],
+        topic: str,
+        num_cards: int,
+        difficulty: str,
+        card_types: List[str]
+    ) -> Dict[str, Any]:
         logger.info(f"Generated response length: {len(response)}")
 
         # ------------------ PARSING ------------------
@@ -2,13 +2,19 @@
 import logging
 import json
 import re
-from typing import List, Dict, Any, Optional
-from app.services.rag.chroma_gemini_rag import ChromaGeminiRAG
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+from app.services.executor import run_blocking
+from app.services.metrics import stage
+from app.services.llm_client import LLMError
+
+if TYPE_CHECKING:
+    from app.services.rag.chroma_gemini_rag import ChromaGeminiRAG
 
 logger = logging.getLogger(__name__)
 
 class QAGenerator:
-    def __init__(self, rag_service: ChromaGeminiRAG):
+    def __init__(self, rag_service: "ChromaGeminiRAG"):
         self.rag_service = rag_service
         logger.info("Initialized QAGenerator")
 
@@ -17,9 +23,15 @@ class QAGenerator:
         topic: str,
         num_questions: int = 5,
         question_types: List[str] = None,
-        difficulty_levels: List[str] = None
+        difficulty_levels: List[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **generate_kwargs
     ) -> Dict[str, Any]:
-        """Generate question-answer pairs for a specific topic from document content."""
+        """Generate question-answer pairs for a specific topic from document content.
+
+        ``filters`` restricts retrieval (see ``document_filter``); extra keyword
+        arguments (e.g. ``use_cache``) go to the RAG service's generate.
+        """
         try:
             if question_types is None:
                 question_types = ['conceptual', 'descriptive']
@@ -27,43 +39,102 @@ class QAGenerator:
                 difficulty_levels = ['easy', 'medium']
             
             logger.info(f"Generating {num_questions} Q&A pairs for topic: {topic}")
-            
-            # Multiple search queries to get comprehensive content
-            search_queries = [
-                f"{topic} definition concept explanation",
-                f"{topic} features characteristics properties",
-                f"{topic} implementation process methodology",
-                f"{topic} advantages benefits disadvantages",
-                f"{topic} examples applications use cases"
-            ]
-            
-            all_results = []
-            for query in search_queries:
-                results = self.rag_service.search(query, k=5)
-                all_results.extend(results)
-            
-            # Remove duplicates and limit results
-            unique_results = []
-            seen_texts = set()
-            for result in all_results:
-                if result["text"] not in seen_texts:
-                    unique_results.append(result)
-                    seen_texts.add(result["text"])
-            
-            results = unique_results[:20]  # Limit to top 20 unique chunks
-            
+
+            results = self._search_context(topic, filters)
             if not results:
-                return {
-                    "success": False,
-                    "error": f"No relevant content found for topic: {topic}",
-                    "qa_pairs": []
-                }
-            
-            # Extract relevant content
-            context = "\n\n".join([r["text"] for r in results])
-            
-            # Generate Q&A pairs with very specific prompt
-            prompt = f"""You are creating educational questions about "{topic}" based ONLY on the following document content.
+                return self._no_content_result(topic)
+
+            with stage("prompt"):
+                prompt = self._build_prompt(topic, num_questions, question_types, difficulty_levels, results)
+            response = self.rag_service.generate(prompt, **generate_kwargs)
+            with stage("parse_response"):
+                return self._build_result(response, results, topic, num_questions)
+                
+        except LLMError:
+            # Quota and availability errors are reported by the caller
+            raise
+        except Exception as e:
+            return self._error_result(e)
+
+    async def agenerate_qa_pairs(
+        self, 
+        topic: str,
+        num_questions: int = 5,
+        question_types: List[str] = None,
+        difficulty_levels: List[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **generate_kwargs
+    ) -> Dict[str, Any]:
+        """Async variant of generate_qa_pairs: retrieval runs on the bounded pool
+        and generation uses the LLM's async invoke."""
+        try:
+            if question_types is None:
+                question_types = ['conceptual', 'descriptive']
+            if difficulty_levels is None:
+                difficulty_levels = ['easy', 'medium']
+
+            logger.info(f"Generating {num_questions} Q&A pairs for topic: {topic}")
+
+            results = await run_blocking(self._search_context, topic, filters)
+            if not results:
+                return self._no_content_result(topic)
+
+            with stage("prompt"):
+                prompt = self._build_prompt(topic, num_questions, question_types, difficulty_levels, results)
+            response = await self.rag_service.agenerate(prompt, **generate_kwargs)
+            with stage("parse_response"):
+                return self._build_result(response, results, topic, num_questions)
+
+        except LLMError:
+            # Quota and availability errors are reported by the caller
+            raise
+        except Exception as e:
+            return self._error_result(e)
+
+    def _search_context(
+        self, topic: str, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        # Multiple search queries to get comprehensive content
+        search_queries = [
+            f"{topic} definition concept explanation",
+            f"{topic} features characteristics properties",
+            f"{topic} implementation process methodology",
+            f"{topic} advantages benefits disadvantages",
+            f"{topic} examples applications use cases"
+        ]
+        
+        # One batched lookup; chunks found by several queries are merged
+        return self.rag_service.search_many(search_queries, k=5, filters=filters, limit=20)  # Limit to top 20 unique chunks
+
+    def _no_content_result(self, topic: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"No relevant content found for topic: {topic}",
+            "qa_pairs": []
+        }
+
+    def _error_result(self, e: Exception) -> Dict[str, Any]:
+        error_msg = f"Error generating Q&A pairs: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            "success": False,
+            "error": error_msg,
+            "qa_pairs": []
+        }
+
+    def _build_prompt(
+        self,
+        topic: str,
+        num_questions: int,
+        question_types: List[str],
+        difficulty_levels: List[str],
+        results: List[Dict[str, Any]]
+    ) -> str:
+        # Extract relevant content
+        context = "\n\n".join([r["text"] for r in results])
+        
+        # Generate Q&A pairs with very specific prompt
+        return f"""You are creating educational questions about "{topic}" based ONLY on the following document content.
 
 DOCUMENT CONTENT:
 {context}
@@ -96,38 +167,31 @@ RETURN ONLY VALID JSON:
     ]
 }}"""
 
-            response = self.rag_service.generate(prompt)
-            logger.info(f"Generated response length: {len(response)}")
-            
-            # Try to extract JSON from response
-            qa_pairs = self._extract_qa_from_response(response, topic, num_questions)
-            
-            if qa_pairs:
-                logger.info(f"Successfully extracted {len(qa_pairs)} Q&A pairs")
-                return {
-                    "success": True,
-                    "qa_pairs": qa_pairs,
-                    "topic": topic,
-                    "total_questions": len(qa_pairs),
-                    "difficulty_distribution": self._calculate_difficulty_distribution(qa_pairs),
-                    "topics_covered": [topic],
-                    "source_chunks_used": len(results)
-                }
-            else:
-                logger.error(f"Failed to extract Q&A pairs. Response: {response}")
-                return {
-                    "success": False,
-                    "error": "Failed to generate valid Q&A pairs",
-                    "raw_response": response[:500] + "..." if len(response) > 500 else response,
-                    "qa_pairs": []
-                }
-                
-        except Exception as e:
-            error_msg = f"Error generating Q&A pairs: {str(e)}"
-            logger.error(error_msg, exc_info=True)
+    def _build_result(
+        self, response: str, results: List[Dict[str, Any]], topic: str, num_questions: int
+    ) -> Dict[str, Any]:
+        logger.info(f"Generated response length: {len(response)}")
+        
+        # Try to extract JSON from response
+        qa_pairs = self._extract_qa_from_response(response, topic, num_questions)
+        
+        if qa_pairs:
+            logger.info(f"Successfully extracted {len(qa_pairs)} Q&A pairs")
+            return {
+                "success": True,
+                "qa_pairs": qa_pairs,
+                "topic": topic,
+                "total_questions": len(qa_pairs),
+                "difficulty_distribution": self._calculate_difficulty_distribution(qa_pairs),
+                "topics_covered": [topic],
+                "source_chunks_used": len(results)
+            }
+        else:
+            logger.error(f"Failed to extract Q&A pairs. Response: {response}")
             return {
                 "success": False,
-                "error": error_msg,
+                "error": "Failed to generate valid Q&A pairs",
+                "raw_response": response[:500] + "..." if len(response) > 500 else response,
                 "qa_pairs": []
             }
 
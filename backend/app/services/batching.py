@@ -0,0 +1,15 @@
+# backend/app/services/batching.py
+import itertools
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """Yield lists of up to ``batch_size`` items without materialising the input."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
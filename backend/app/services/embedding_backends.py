@@ -0,0 +1,51 @@
+# backend/app/services/embedding_backends.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+# "torch" is the plain float sentence-transformers model. "torch-int8" applies
+# PyTorch dynamic int8 quantization to its Linear layers; "onnx" and
+# "onnx-int8" run through ONNX Runtime (needs optimum[onnxruntime]).
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Pre-quantized graph shipped in the sentence-transformers model repos
+DEFAULT_ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+def load_embedding_model(model_name: str, backend: str = "torch", onnx_file: str = None):
+    """Load a SentenceTransformer for CPU inference with the given backend."""
+    from sentence_transformers import SentenceTransformer
+
+    backend = backend.lower()
+    if backend == "torch":
+        model = SentenceTransformer(model_name, device="cpu")
+
+    elif backend == "torch-int8":
+        import torch
+
+        model = torch.quantization.quantize_dynamic(
+            SentenceTransformer(model_name, device="cpu"),
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+
+    elif backend in ("onnx", "onnx-int8"):
+        model_kwargs = {}
+        if backend == "onnx-int8":
+            model_kwargs["file_name"] = onnx_file or DEFAULT_ONNX_INT8_FILE
+        model = SentenceTransformer(
+            model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs
+        )
+
+    else:
+        raise ValueError(
+            f"Unsupported embedding backend: {backend} (expected one of {', '.join(EMBEDDING_BACKENDS)})"
+        )
+
+    logger.info(f"Loaded embedding model {model_name} with backend {backend}")
+    return model
+
+
+def cache_model_key(model_name: str, backend: str = "torch") -> str:
+    """Name used to keep cached vectors from different backends apart."""
+    return model_name if backend.lower() == "torch" else f"{model_name}@{backend.lower()}"
@@ -0,0 +1,92 @@
+# backend/app/services/embedding_batcher.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingBatcher:
+    """Coalesces concurrent single-query embeddings into batched encode calls.
+
+    Callers block in ``embed`` while a background thread gathers requests for
+    up to ``max_wait_ms`` (or until ``max_batch_size`` arrive), runs one
+    ``encode`` call over the batch and hands each caller its own vector.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._encode = encode
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self.batches = 0
+        self.queries = 0
+
+    def embed(self, text: str) -> Any:
+        """Embed one query, sharing the model call with concurrent callers."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_many(self, texts: List[str]) -> List[Any]:
+        """Embed several queries; they join the same batches as ``embed`` calls."""
+        self._ensure_worker()
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "batches": self.batches,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _ensure_worker(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="query-embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self._encode(texts)
+            except Exception as e:
+                logger.error(f"Error embedding query batch of {len(texts)}: {str(e)}", exc_info=True)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.queries += len(texts)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
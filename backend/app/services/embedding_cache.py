@@ -0,0 +1,229 @@
+# backend/app/services/embedding_cache.py
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Recency updates from cache hits are written in batches of this many keys,
+# or at least this often, instead of one commit per lookup
+TOUCH_FLUSH_KEYS = 256
+TOUCH_FLUSH_SECONDS = 30.0
+
+
+class EmbeddingCache:
+    """On-disk cache of embedding vectors keyed by (model name, normalized text).
+
+    Vectors are stored as float16 rows in a memory-mapped ``.npy`` file; a
+    SQLite index maps each key to its row and tracks last use so the least
+    recently used rows are reused once ``max_entries`` is reached.
+
+    Several processes (e.g. uvicorn workers) may share ``cache_dir``: reads and
+    writes hold a lock file next to the index, and last-use times of hits are
+    written in batches.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: int = 200_000):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        model_dir = os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9._-]+", "_", model_name))
+        os.makedirs(model_dir, exist_ok=True)
+        self._vectors_path = os.path.join(model_dir, "vectors.npy")
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(model_dir, "lock"), "a+b")
+        self._pending_touches: Dict[str, float] = {}
+        self._last_touch_flush = time.monotonic()
+
+        self._db = sqlite3.connect(os.path.join(model_dir, "index.sqlite3"), check_same_thread=False, timeout=30)
+        with self._lock, self._process_lock():
+            self._open()
+        logger.info(f"Initialized EmbeddingCache for {model_name} at {model_dir}")
+
+    @contextmanager
+    def _process_lock(self, shared: bool = False) -> Iterator[None]:
+        """Serialize access with other processes using the same cache directory
+        (caller holds ``self._lock``)."""
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _open(self) -> None:
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._db.commit()
+
+        self._vectors: Optional[np.ndarray] = None
+        if os.path.exists(self._vectors_path):
+            vectors = np.load(self._vectors_path, mmap_mode="r+")
+            if vectors.shape[0] == self.max_entries:
+                self._vectors = vectors
+            else:
+                # Capacity changed: start over rather than remap slots
+                del vectors
+                self._reset()
+
+    def _key(self, text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self.model_name}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _reset(self) -> None:
+        self._db.execute("DELETE FROM entries")
+        self._db.commit()
+        if os.path.exists(self._vectors_path):
+            os.remove(self._vectors_path)
+        self._vectors = None
+
+    def _ensure_vectors(self, dimension: int) -> np.ndarray:
+        if self._vectors is None and os.path.exists(self._vectors_path):
+            # Another process created the file since we opened the cache
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+        if self._vectors is not None and self._vectors.shape[1] != dimension:
+            logger.warning(f"Embedding dimension changed for {self.model_name}; clearing cache")
+            self._vectors = None
+            self._reset()
+        if self._vectors is None:
+            self._vectors = np.lib.format.open_memmap(
+                self._vectors_path, mode="w+", dtype=np.float16,
+                shape=(self.max_entries, dimension)
+            )
+        return self._vectors
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, int]:
+        """Map the keys that are present to their slots (caller holds the lock)."""
+        found: Dict[str, int] = {}
+        unique_keys = list(set(keys))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({','.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return the cached vector for each text, or None where it is missing."""
+        keys = [self._key(text) for text in texts]
+        with self._lock, self._process_lock(shared=True):
+            if self._vectors is None and os.path.exists(self._vectors_path):
+                self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+            found = self._lookup(keys) if self._vectors is not None else {}
+
+            if found:
+                now = time.time()
+                self._pending_touches.update((key, now) for key in found)
+
+            results = [
+                np.asarray(self._vectors[found[key]], dtype=np.float32) if key in found else None
+                for key in keys
+            ]
+            hit_count = sum(1 for key in keys if key in found)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+
+        if found and (
+            len(self._pending_touches) >= TOUCH_FLUSH_KEYS
+            or time.monotonic() - self._last_touch_flush >= TOUCH_FLUSH_SECONDS
+        ):
+            with self._lock, self._process_lock():
+                self._flush_touches()
+                self._db.commit()
+        return results
+
+    def _flush_touches(self) -> None:
+        """Write batched last-use times (caller holds both locks and commits)."""
+        if self._pending_touches:
+            self._db.executemany(
+                "UPDATE entries SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(used, key) for key, used in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for texts, evicting the least recently used entries if full."""
+        if not texts:
+            return
+        entries = dict(zip((self._key(text) for text in texts), vectors))
+        with self._lock, self._process_lock():
+            storage = self._ensure_vectors(len(next(iter(entries.values()))))
+            # Recency must be current before choosing what to evict
+            self._flush_touches()
+            existing = self._lookup(list(entries))
+
+            new_keys = [key for key in entries if key not in existing]
+            count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            free = max(0, self.max_entries - count)
+            slots = list(range(count, count + min(free, len(new_keys))))
+
+            evict_count = len(new_keys) - len(slots)
+            if evict_count:
+                # Never hand out the slot of a key this call is rewriting
+                candidates = self._db.execute(
+                    "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (evict_count + len(existing),)
+                ).fetchall()
+                evicted = [(key, slot) for key, slot in candidates if key not in existing][:evict_count]
+                self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+                slots.extend(slot for _, slot in evicted)
+            # More new keys than the cache can hold: keep the ones that got a slot
+            new_keys = new_keys[:len(slots)]
+
+            now = time.time()
+            rows = []
+            for key, slot in zip(new_keys, slots):
+                storage[slot] = np.asarray(entries[key], dtype=np.float16)
+                rows.append((key, slot, now))
+            for key, slot in existing.items():
+                storage[slot] = np.asarray(entries[key], dtype=np.float16)
+                rows.append((key, slot, now))
+
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+            storage.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock, self._process_lock(shared=True):
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,27 +1,76 @@
 # backend/app/services/embedding_service.py
 import numpy as np
-from typing import List
-from sentence_transformers import SentenceTransformer
+from typing import List, Optional
 import logging
 
+from app.config import settings
+from app.services.embedding_backends import cache_model_key
+from app.services.embedding_batcher import QueryEmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+from app.services.model_registry import model_registry
+
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        cache: Optional[EmbeddingCache] = None,
+        backend: Optional[str] = None
+    ):
+        self.backend = backend or settings.EMBEDDING_BACKEND
+        # Shared with every other user of the same model in this process
+        self.model = model_registry.get(model_name, self.backend, settings.EMBEDDING_ONNX_FILE)
         self.dimension = self.model.get_sentence_embedding_dimension()
-        logger.info(f"Initialized EmbeddingService with model: {model_name}")
+        if cache is None and settings.EMBEDDING_CACHE_ENABLED:
+            cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_DIR,
+                cache_model_key(model_name, self.backend),
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+            )
+        self.cache = cache
+        self.query_batcher = None
+        if settings.QUERY_BATCHING_ENABLED:
+            self.query_batcher = QueryEmbeddingBatcher(
+                lambda texts: self.model.encode(texts, show_progress_bar=False),
+                max_batch_size=settings.QUERY_BATCH_MAX_SIZE,
+                max_wait_ms=settings.QUERY_BATCH_MAX_WAIT_MS
+            )
+        logger.info(f"Initialized EmbeddingService with model: {model_name} ({self.backend} backend)")
 
     def create_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for a list of texts."""
+        """Generate embeddings for a list of texts, reusing cached vectors."""
         try:
-            embeddings = self.model.encode(texts, show_progress_bar=False)
-            logger.info(f"Generated embeddings for {len(texts)} texts")
-            return embeddings
+            if self.cache is None:
+                embeddings = self.model.encode(texts, show_progress_bar=False)
+                logger.info(f"Generated embeddings for {len(texts)} texts")
+                return embeddings
+
+            cached = self.cache.get_many(texts)
+            missing = [i for i, vector in enumerate(cached) if vector is None]
+            if missing:
+                computed = self.model.encode([texts[i] for i in missing], show_progress_bar=False)
+                self.cache.put_many([texts[i] for i in missing], computed)
+                for i, vector in zip(missing, computed):
+                    cached[i] = vector
+
+            logger.info(f"Generated embeddings for {len(texts)} texts ({len(texts) - len(missing)} cached)")
+            return np.array(cached, dtype=np.float32).reshape(len(texts), self.dimension)
         except Exception as e:
             logger.error(f"Error creating embeddings: {str(e)}", exc_info=True)
             raise
 
     def embed_query(self, query: str) -> np.ndarray:
-        """Generate embedding for a single query."""
-        return self.create_embeddings([query])[0]
\ No newline at end of file
+        """Generate embedding for a single query, batched with concurrent queries."""
+        if self.query_batcher is None:
+            return self.create_embeddings([query])[0]
+
+        if self.cache is not None:
+            cached = self.cache.get_many([query])[0]
+            if cached is not None:
+                return cached
+
+        embedding = np.asarray(self.query_batcher.embed(query), dtype=np.float32)
+        if self.cache is not None:
+            self.cache.put_many([query], [embedding])
+        return embedding
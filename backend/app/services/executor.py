@@ -0,0 +1,35 @@
+# backend/app/services/executor.py
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Bounded pool for vector-store, embedding and parsing calls made from async code"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BLOCKING_POOL_SIZE, thread_name_prefix="blocking"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a synchronous call on the bounded pool without blocking the event loop
+
+    The call sees the caller's context variables (e.g. the metrics endpoint).
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_blocking_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
@@ -0,0 +1,159 @@
+# backend/app/services/fake_llm.py
+import asyncio
+import collections
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import AsyncIterator, Callable, List, Optional
+
+
+class FakeResourceExhausted(Exception):
+    """Stands in for the provider's 429 quota error."""
+
+
+class FakeServiceUnavailable(Exception):
+    """Stands in for the provider's 503 error."""
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+QA_PROMPT = re.compile(r'Create exactly (\d+) UNIQUE question-answer pairs specifically about "(.+?)"')
+FLASHCARD_PROMPT = re.compile(r"Create (\d+) flashcards about (.+?) based on the context")
+WORD = re.compile(r"[A-Za-z][A-Za-z-]{3,}")
+
+
+def _prompt_words(prompt: str, count: int, start: str = "", end: str = "") -> List[str]:
+    """Pick ``count`` words of the prompt (between ``start`` and ``end`` if they
+    occur), the same ones for the same prompt."""
+    text = prompt
+    if start and start in text:
+        text = text.split(start, 1)[1]
+    if end and end in text:
+        text = text.split(end, 1)[0]
+    words = WORD.findall(text) or ["content"]
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    return [rng.choice(words).lower() for _ in range(count)]
+
+
+def canned_response(prompt: str) -> str:
+    """Deterministic answer in the format the prompt asks for.
+
+    Q&A prompts get the ``{"qa_pairs": [...]}`` JSON QAGenerator parses,
+    flashcard prompts get Question/Answer/Type blocks, and anything else
+    (summaries) a few sentences built from the prompt's own words.
+    """
+    match = QA_PROMPT.search(prompt)
+    if match:
+        count, topic = int(match.group(1)), match.group(2)
+        words = _prompt_words(prompt, count * 3, "DOCUMENT CONTENT:", "TASK:")
+        pairs = [
+            {
+                "question": f"How does {topic} relate to {words[3 * i]}?",
+                "answer": f"{topic} connects {words[3 * i]} with {words[3 * i + 1]} and {words[3 * i + 2]}.",
+                "type": "conceptual",
+                "difficulty": ("easy", "medium", "hard")[i % 3],
+                "topic": topic,
+            }
+            for i in range(count)
+        ]
+        return json.dumps({"qa_pairs": pairs}, indent=2)
+
+    match = FLASHCARD_PROMPT.search(prompt)
+    if match:
+        count, topic = int(match.group(1)), match.group(2)
+        words = _prompt_words(prompt, count * 2, "Context:", "Each flashcard")
+        return "\n\n".join(
+            f"Question: What is the role of {words[2 * i]} in {topic}?\n"
+            f"Answer: In {topic}, {words[2 * i]} works together with {words[2 * i + 1]}.\n"
+            f"Type: {('definition', 'concept', 'application')[i % 3]}"
+            for i in range(count)
+        )
+
+    words = _prompt_words(prompt, 48)
+    sentences = [
+        f"The material discusses {words[i]} together with {words[i + 1]}, {words[i + 2]} and {words[i + 3]}."
+        for i in range(0, len(words), 4)
+    ]
+    return " ".join(sentences)
+
+
+class FakeChatModel:
+    """Local stand-in for a LangChain chat model (invoke, ainvoke, astream).
+
+    Each call waits ``latency_seconds`` before the first token and then
+    produces ``tokens_per_second`` whitespace-separated tokens per second
+    (0 = instantly). ``quota_per_minute`` makes it raise FakeResourceExhausted
+    once that many calls were made in the last minute, and ``failure_rate``
+    makes a share of calls raise FakeServiceUnavailable, so quota handling
+    and load can be exercised without touching the real API.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str], str] = canned_response,
+        latency_seconds: float = 0.0,
+        tokens_per_second: float = 0.0,
+        quota_per_minute: Optional[int] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.responder = responder
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.quota_per_minute = quota_per_minute
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.rejected = 0
+        self._random = random.Random(seed)
+        self._recent = collections.deque()
+        self._lock = threading.Lock()
+
+    def _admit(self) -> None:
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if self.quota_per_minute is not None and len(self._recent) >= self.quota_per_minute:
+                self.rejected += 1
+                raise FakeResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+            if self._random.random() < self.failure_rate:
+                self.rejected += 1
+                raise FakeServiceUnavailable("503 The service is currently unavailable.")
+            self._recent.append(now)
+
+    def _duration(self, text: str) -> float:
+        generation = len(text.split()) / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return self.latency_seconds + generation
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        self._admit()
+        text = self.responder(prompt)
+        duration = self._duration(text)
+        if duration:
+            time.sleep(duration)
+        return FakeMessage(text)
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        self._admit()
+        text = self.responder(prompt)
+        duration = self._duration(text)
+        if duration:
+            await asyncio.sleep(duration)
+        return FakeMessage(text)
+
+    async def astream(self, prompt: str) -> AsyncIterator[FakeMessage]:
+        self._admit()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        words = self.responder(prompt).split(" ")
+        for i, word in enumerate(words):
+            if self.tokens_per_second > 0 and i:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield FakeMessage(word if i == 0 else " " + word)
@@ -0,0 +1,239 @@
+# backend/app/services/ingestion.py
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.config import settings
+from app.models.job import IngestionJob
+from app.services.document_processor import DocumentProcessor
+from app.services.metrics import endpoint_context
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept around for status queries before the oldest are dropped
+MAX_FINISHED_JOBS = 1000
+
+
+class IngestionJobQueue:
+    """Runs DocumentProcessor -> embeddings -> vector store off the request path."""
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ingest"
+        )
+        # Summaries take many LLM calls; keep them from holding up the next ingest
+        self._summary_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="summarize"
+        )
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+        logger.info(f"Initialized IngestionJobQueue with {max_workers} worker(s)")
+
+    def submit(
+        self,
+        document_id: str,
+        filename: str,
+        file_path: str,
+        size: int,
+        document_name: Optional[str] = None,
+    ) -> IngestionJob:
+        """Queue a saved upload for ingestion and return its job record.
+
+        If the same document is already being ingested, that job is returned.
+        """
+        now = time.time()
+        job = IngestionJob(
+            id=str(uuid.uuid4()),
+            document_id=document_id,
+            filename=filename,
+            file_path=file_path,
+            size=size,
+            document_name=document_name,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            active = self._find_active(document_id)
+            if active:
+                return active.model_copy()
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job.id)
+        logger.info(f"Queued ingestion job {job.id} for {filename}")
+        return job.model_copy()
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def get_active(self, document_id: str) -> Optional[IngestionJob]:
+        """The queued or running job for this document, if any."""
+        with self._lock:
+            job = self._find_active(document_id)
+            return job.model_copy() if job else None
+
+    def _find_active(self, document_id: str) -> Optional[IngestionJob]:
+        for job in self._jobs.values():
+            if job.document_id == document_id and job.status not in ("completed", "failed"):
+                return job
+        return None
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.updated_at = time.time()
+
+    def _prune(self) -> None:
+        finished = [
+            job for job in self._jobs.values()
+            if job.status in ("completed", "failed")
+        ]
+        excess = len(finished) - MAX_FINISHED_JOBS
+        if excess > 0:
+            finished.sort(key=lambda job: job.updated_at)
+            for job in finished[:excess]:
+                del self._jobs[job.id]
+
+    def _run(self, job_id: str) -> None:
+        with endpoint_context("ingest"):
+            self._run_job(job_id)
+
+    def _run_job(self, job_id: str) -> None:
+        job = self.get(job_id)
+        try:
+            self._update(job_id, status="processing")
+            processor = DocumentProcessor(
+                settings.CHUNK_SIZE, settings.CHUNK_OVERLAP, pdf_workers=settings.PDF_EXTRACT_WORKERS
+            )
+
+            # Parsing, embedding and writing overlap: chunks flow through in batches
+            def counted_chunks():
+                total = 0
+                for chunk in processor.iter_chunks(
+                    job.file_path,
+                    document_id=job.document_id,
+                    progress_callback=lambda pages: self._update(job_id, pages_parsed=pages),
+                ):
+                    total += 1
+                    self._update(job_id, chunks_total=total)
+                    yield chunk
+
+            def on_progress(stage: str, count: int) -> None:
+                if stage == "embedded":
+                    self._update(job_id, chunks_embedded=count)
+                elif stage == "written":
+                    self._update(job_id, chunks_written=count)
+
+            from rag_singleton import get_rag_service
+            rag_service = get_rag_service()
+
+            if job.document_name:
+                # Only re-embed what changed since the last version of this document
+                stats = rag_service.reingest_document(
+                    job.document_name, counted_chunks(), progress_callback=on_progress
+                )
+                if stats is None:
+                    raise RuntimeError("Failed to re-ingest document into ChromaDB")
+                self._update(
+                    job_id,
+                    chunks_unchanged=stats["unchanged"],
+                    chunks_deleted=stats["deleted"],
+                )
+                for old_document_id in stats["replaced_document_ids"]:
+                    self._drop_summary(old_document_id)
+            elif not rag_service.add_documents(counted_chunks(), progress_callback=on_progress):
+                raise RuntimeError("Failed to add document to ChromaDB")
+
+            if not self.get(job_id).chunks_written:
+                raise ValueError("No text could be extracted from this file.")
+
+            self._update(job_id, status="completed")
+            logger.info(f"Job {job_id}: document stored in ChromaDB")
+
+            if settings.PRECOMPUTE_SUMMARIES:
+                self._update(job_id, summary_status="queued")
+                self._summary_executor.submit(self._summarize, job_id)
+
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {str(e)}", exc_info=True)
+            # Batches written before the failure would pass for a stored document
+            self._discard_partial(job)
+            self._update(job_id, status="failed", error=str(e))
+
+    def _discard_partial(self, job: IngestionJob) -> None:
+        """Delete what the failed job wrote under its document id. A failed
+        re-ingest leaves the previous version under the old id, so it stays."""
+        try:
+            from rag_singleton import get_rag_service
+            get_rag_service().delete_document(job.document_id)
+        except Exception as e:
+            logger.error(f"Could not remove partial chunks of {job.document_id}: {str(e)}", exc_info=True)
+
+    def _drop_summary(self, document_id: str) -> None:
+        """Forget the precomputed summary of a document id that no longer exists"""
+        if not settings.PRECOMPUTE_SUMMARIES:
+            return
+        try:
+            from app.services.summary_store import get_summary_store
+            get_summary_store().delete(document_id)
+        except Exception as e:
+            logger.error(f"Could not remove the summary of {document_id}: {str(e)}", exc_info=True)
+
+    def _summarize(self, job_id: str) -> None:
+        """Precompute and store the hierarchical summary of a completed job's document"""
+        with endpoint_context("ingest_summary"):
+            self._summarize_job(job_id)
+
+    def _summarize_job(self, job_id: str) -> None:
+        job = self.get(job_id)
+        try:
+            self._update(job_id, summary_status="processing")
+            from app.services.academic.document_summarizer import DocumentSummarizer
+            from app.services.summary_store import get_summary_store
+            from rag_singleton import get_rag_service
+
+            summarizer = DocumentSummarizer(
+                get_rag_service(),
+                group_size=settings.SUMMARY_GROUP_SIZE,
+                section_size=settings.SUMMARY_SECTION_SIZE
+            )
+            result = summarizer.summarize(
+                job.document_id, concurrency=settings.SUMMARY_CONCURRENCY
+            )
+            if result is None:
+                self._update(job_id, summary_status="skipped")
+                return
+
+            get_summary_store().put(
+                job.document_id,
+                style=result["style"],
+                length=result["length"],
+                summary=result["summary"],
+                sections=result["sections"],
+                chunks=result["chunks"]
+            )
+            self._update(job_id, summary_status="completed")
+            logger.info(f"Job {job_id}: summary stored for {job.document_id}")
+
+        except Exception as e:
+            logger.error(f"Summary for job {job_id} failed: {str(e)}", exc_info=True)
+            self._update(job_id, summary_status="failed", summary_error=str(e))
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_ingestion_queue() -> IngestionJobQueue:
+    """Get the process-wide ingestion job queue"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = IngestionJobQueue(max_workers=settings.INGEST_WORKERS)
+        return _job_queue
@@ -0,0 +1,447 @@
+# backend/app/services/llm_client.py
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough prompt size in tokens for the tokens-per-minute budget
+CHARS_PER_TOKEN = 4
+
+
+class LLMError(Exception):
+    """Base class for LLM failures the API reports with a specific status."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMRateLimitError(LLMError):
+    """Quota exhausted, locally or at the provider (HTTP 429)."""
+
+
+class LLMUnavailableError(LLMError):
+    """Provider failing or circuit breaker open (HTTP 503)."""
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """Return "rate_limit" or "unavailable" for retryable provider errors, else None.
+
+    Matches on type name and message so the provider SDKs need not be imported.
+    """
+    if isinstance(error, LLMRateLimitError):
+        return "rate_limit"
+    if isinstance(error, LLMUnavailableError):
+        return "unavailable"
+
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    if (
+        any(part in name for part in ("resourceexhausted", "ratelimit", "toomanyrequests"))
+        or re.search(r"\b429\b|quota|rate limit", message)
+    ):
+        return "rate_limit"
+    if (
+        any(part in name for part in (
+            "serviceunavailable", "deadlineexceeded", "internalservererror", "timeout", "connection"
+        ))
+        or re.search(r"\b50[0234]\b|unavailable", message)
+    ):
+        return "unavailable"
+    return None
+
+
+def _prompt_tokens(prompt: str) -> int:
+    return max(1, len(prompt) // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to a burst of ``capacity``."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` if available and return 0, else return seconds to wait."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def refund(self, amount: float) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and rejects calls
+    for ``reset_seconds``; then lets one trial call through (half-open)."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.opened = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reject_if_unavailable(self) -> None:
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                raise LLMUnavailableError(
+                    "LLM circuit breaker is open after repeated failures", retry_after=remaining
+                )
+        elif self.state == "half_open":
+            # Only the trial call may run until it reports back
+            raise LLMUnavailableError("LLM circuit breaker is testing the provider", retry_after=1.0)
+
+    def check(self) -> None:
+        """Raise as ``before_call`` would, without starting a trial call."""
+        with self._lock:
+            self._reject_if_unavailable()
+
+    def before_call(self) -> None:
+        with self._lock:
+            self._reject_if_unavailable()
+            if self.state == "open":
+                self.state = "half_open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened += 1
+                    logger.warning(f"LLM circuit breaker opened after {self._failures} failures")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def record_neutral(self) -> None:
+        """A call that failed for reasons unrelated to provider health."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "closed"
+
+
+class ConcurrencyGate:
+    """At most ``limit`` holders at once, shared by threads and coroutines.
+
+    Threads block in ``acquire``; coroutines ``await aacquire()`` without
+    blocking their event loop and are handed a slot by ``release``.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_use = 0
+        self._async_waiters: Deque[asyncio.Future] = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def acquire(self) -> None:
+        with self._available:
+            while self._in_use >= self.limit:
+                self._available.wait()
+            self._in_use += 1
+
+    async def aacquire(self) -> None:
+        with self._lock:
+            if self._in_use < self.limit and not self._async_waiters:
+                self._in_use += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._async_waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+                    raise
+            # A slot was handed over; unless _hand_over gives it back
+            # because the waiter was cancelled first, pass it on
+            if not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if self._async_waiters:
+                # The slot moves to the waiter, so the count stays
+                waiter = self._async_waiters.popleft()
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+                return
+            self._in_use -= 1
+            self._available.notify()
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.cancelled():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+    def __enter__(self) -> "ConcurrencyGate":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "ConcurrencyGate":
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ResilientLLMClient:
+    """Wraps a LangChain chat model with quota limits, retries and a breaker.
+
+    Every call waits for the request and token buckets (failing with
+    LLMRateLimitError if that would take longer than ``max_queue_seconds``),
+    holds one of ``max_concurrency`` slots (shared by sync and async
+    callers) while it runs, and retries rate-limit and availability errors
+    with jittered exponential backoff.
+    Exhausted retries raise LLMRateLimitError or LLMUnavailableError; other
+    errors propagate unchanged.
+    """
+
+    def __init__(
+        self,
+        llm,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 30.0,
+        max_queue_seconds: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.llm = llm
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_queue_seconds = max_queue_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = ConcurrencyGate(max_concurrency)
+
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.unavailable = 0
+        self.throttled_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    # ------------------ limits ------------------
+
+    def _reserve(self, prompt: str) -> float:
+        """Seconds to wait before both buckets admit this call (0 = admitted)."""
+        wait = self.request_bucket.reserve(1) if self.request_bucket else 0.0
+        if wait == 0.0 and self.token_bucket:
+            wait = self.token_bucket.reserve(_prompt_tokens(prompt))
+            if wait > 0 and self.request_bucket:
+                # Give the request slot back; we will try both again
+                self.request_bucket.refund(1)
+        return wait
+
+    def _refund(self, prompt: str) -> None:
+        """Return a reservation for a call that never reached the provider."""
+        if self.request_bucket:
+            self.request_bucket.refund(1)
+        if self.token_bucket:
+            self.token_bucket.refund(_prompt_tokens(prompt))
+
+    def _start_call(self, prompt: str) -> None:
+        """``breaker.before_call``, refunding the quota if the breaker says no."""
+        try:
+            self.breaker.before_call()
+        except LLMError:
+            self._refund(prompt)
+            raise
+
+    def _check_queue(self, waited: float, wait: float) -> None:
+        if waited + wait > self.max_queue_seconds:
+            with self._stats_lock:
+                self.rate_limited += 1
+            raise LLMRateLimitError("Local LLM quota exhausted; try again later", retry_after=wait)
+
+    def _throttle(self, prompt: str) -> None:
+        waited = 0.0
+        while True:
+            wait = self._reserve(prompt)
+            if wait == 0.0:
+                break
+            self._check_queue(waited, wait)
+            time.sleep(wait)
+            waited += wait
+        self._record_throttle(waited)
+
+    async def _athrottle(self, prompt: str) -> None:
+        waited = 0.0
+        while True:
+            wait = self._reserve(prompt)
+            if wait == 0.0:
+                break
+            self._check_queue(waited, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+        self._record_throttle(waited)
+
+    def _record_throttle(self, waited: float) -> None:
+        with self._stats_lock:
+            self.calls += 1
+            self.throttled_seconds += waited
+
+    # ------------------ retries ------------------
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        # Full jitter, but never sooner than the provider asked for
+        delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+        retry_after = getattr(error, "retry_after", None)
+        return max(delay, retry_after or 0.0)
+
+    def _record_error(self, kind: Optional[str]) -> None:
+        # Quota errors say nothing about provider health; they surface as 429
+        # with Retry-After instead of tripping the breaker into 503s
+        if kind == "unavailable":
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_neutral()
+
+    def _on_failure(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; return the delay before retrying, or raise."""
+        kind = classify_error(error)
+        if kind is None:
+            self.breaker.record_neutral()
+            raise error
+
+        self._record_error(kind)
+        if attempt < self.max_retries and self.breaker.state != "open":
+            with self._stats_lock:
+                self.retries += 1
+            delay = self._backoff(attempt, error)
+            logger.warning(f"LLM call failed ({kind}), retrying in {delay:.2f}s: {str(error)}")
+            return delay
+
+        with self._stats_lock:
+            if kind == "rate_limit":
+                self.rate_limited += 1
+            else:
+                self.unavailable += 1
+        if isinstance(error, LLMError):
+            raise error
+        if kind == "rate_limit":
+            raise LLMRateLimitError(
+                f"LLM provider quota exhausted: {str(error)}",
+                retry_after=getattr(error, "retry_after", None) or self.backoff_max_seconds
+            ) from error
+        raise LLMUnavailableError(
+            f"LLM provider unavailable: {str(error)}", retry_after=self.breaker.reset_seconds
+        ) from error
+
+    # ------------------ calls ------------------
+
+    # The breaker is checked before any quota is reserved, but the half-open
+    # trial only starts (``before_call``) once the local waits for quota and a
+    # slot are over. A trial that ends without an outcome (cancelled, stream
+    # closed) reports neutral rather than leaving the breaker half-open.
+
+    def invoke(self, prompt: str):
+        for attempt in range(self.max_retries + 1):
+            self.breaker.check()
+            self._throttle(prompt)
+            with self._slots:
+                self._start_call(prompt)
+                try:
+                    response = self.llm.invoke(prompt)
+                except Exception as e:
+                    delay = self._on_failure(e, attempt)
+                except BaseException:
+                    self.breaker.record_neutral()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    return response
+            time.sleep(delay)
+
+    async def ainvoke(self, prompt: str):
+        for attempt in range(self.max_retries + 1):
+            self.breaker.check()
+            await self._athrottle(prompt)
+            async with self._slots:
+                self._start_call(prompt)
+                try:
+                    response = await self.llm.ainvoke(prompt)
+                except Exception as e:
+                    delay = self._on_failure(e, attempt)
+                except BaseException:
+                    self.breaker.record_neutral()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    return response
+            await asyncio.sleep(delay)
+
+    async def astream(self, prompt: str) -> AsyncIterator[Any]:
+        """Stream chunks; retries only happen before the first chunk is yielded."""
+        for attempt in range(self.max_retries + 1):
+            self.breaker.check()
+            await self._athrottle(prompt)
+            async with self._slots:
+                self._start_call(prompt)
+                started = False
+                try:
+                    async for chunk in self.llm.astream(prompt):
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    if started:
+                        self._record_error(classify_error(e))
+                        raise
+                    delay = self._on_failure(e, attempt)
+                except BaseException:
+                    # GeneratorExit or CancelledError: the consumer went away
+                    self.breaker.record_neutral()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    return
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "unavailable": self.unavailable,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "max_concurrency": self.max_concurrency,
+            "circuit_breaker": self.breaker.state,
+            "circuit_breaker_opened": self.breaker.opened,
+        }
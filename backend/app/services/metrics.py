@@ -0,0 +1,211 @@
+# backend/app/services/metrics.py
+import bisect
+import contextvars
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds; from a cached lookup up to a slow LLM call
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Characters of prompts and responses
+SIZE_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "mentor_requests_total", "HTTP requests by route template, method and status", ("endpoint", "method", "status")
+)
+STAGE_SECONDS = registry.histogram(
+    "mentor_stage_duration_seconds", "Time spent in each processing stage, per endpoint", ("endpoint", "stage")
+)
+PAYLOAD_CHARS = registry.histogram(
+    "mentor_llm_payload_chars", "Size of LLM prompts and responses in characters", ("endpoint", "kind"), SIZE_BUCKETS
+)
+CACHE_LOOKUPS = registry.counter(
+    "mentor_cache_lookups_total", "Cache lookups by cache and result (hit or miss)", ("endpoint", "cache", "result")
+)
+ERRORS = registry.counter(
+    "mentor_errors_total", "Failures by endpoint, stage and exception type", ("endpoint", "stage", "error")
+)
+
+# Route template of the request being served; background work sets its own name
+_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar("metrics_endpoint", default="background")
+
+
+def current_endpoint() -> str:
+    return _endpoint.get()
+
+
+@contextmanager
+def endpoint_context(name: str) -> Iterator[None]:
+    """Attribute everything recorded inside the block to endpoint ``name``"""
+    token = _endpoint.set(name)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def record_error(stage_name: str, error: BaseException) -> None:
+    ERRORS.inc(endpoint=current_endpoint(), stage=stage_name, error=type(error).__name__)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as stage ``name``; exceptions are counted and re-raised.
+
+    Works around ``await`` too - the duration is wall-clock time.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_error(name, e)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, endpoint=current_endpoint(), stage=name)
+
+
+def timed_iter(items: Iterable[T], stage_name: str) -> Iterator[T]:
+    """Yield from ``items``, recording the time spent producing them (not the
+    consumer's time between items) as one observation of ``stage_name``."""
+    iterator = iter(items)
+    elapsed = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - started
+                return
+            except Exception as e:
+                elapsed += time.perf_counter() - started
+                record_error(stage_name, e)
+                raise
+            elapsed += time.perf_counter() - started
+            yield item
+    finally:
+        STAGE_SECONDS.observe(elapsed, endpoint=current_endpoint(), stage=stage_name)
+
+
+def record_cache(cache: str, hit: bool, count: int = 1) -> None:
+    if count:
+        CACHE_LOOKUPS.inc(count, endpoint=current_endpoint(), cache=cache, result="hit" if hit else "miss")
+
+
+def record_payload(kind: str, text: str) -> None:
+    """``kind`` is "prompt" or "response"."""
+    PAYLOAD_CHARS.observe(len(text or ""), endpoint=current_endpoint(), kind=kind)
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,86 @@
+# backend/app/services/model_registry.py
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.embedding_backends import load_embedding_model
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        import resource
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ImportError, ValueError, IndexError):
+        return None
+
+
+def _parameter_bytes(model) -> int:
+    """Bytes held in the model's torch parameters and buffers (0 for ONNX)."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except AttributeError:
+        return 0
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class EmbeddingModelRegistry:
+    """Process-wide home for embedding models: each is loaded once, on first use.
+
+    Loads of different models can proceed in parallel; concurrent requests
+    for the same model wait for the single load in progress.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str, Optional[str]], Dict[str, Any]] = {}
+        self._load_locks: Dict[Tuple[str, str, Optional[str]], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str, backend: str = "torch", onnx_file: Optional[str] = None):
+        key = (model_name, backend.lower(), onnx_file)
+        entry = self._models.get(key)
+        if entry is not None:
+            return entry["model"]
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            entry = self._models.get(key)
+            if entry is None:
+                rss_before = _rss_bytes()
+                started = time.perf_counter()
+                model = load_embedding_model(model_name, backend, onnx_file)
+                load_seconds = time.perf_counter() - started
+                rss_after = _rss_bytes()
+
+                entry = {
+                    "model": model,
+                    "model_name": model_name,
+                    "backend": key[1],
+                    "load_seconds": round(load_seconds, 3),
+                    "parameter_bytes": _parameter_bytes(model),
+                    "rss_delta_bytes": (
+                        rss_after - rss_before
+                        if rss_before is not None and rss_after is not None else None
+                    ),
+                }
+                self._models[key] = entry
+                logger.info(
+                    f"Registered embedding model {model_name} ({key[1]}) in {load_seconds:.2f}s"
+                )
+            return entry["model"]
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """One row per loaded model with its load time and memory footprint."""
+        return [
+            {name: value for name, value in entry.items() if name != "model"}
+            for entry in list(self._models.values())
+        ]
+
+
+model_registry = EmbeddingModelRegistry()
@@ -1,26 +1,51 @@
 from .base_rag import BaseRAG
-from .langchain_rag import LangChainRAG
 from app.config import settings
 
+# Provider modules pull in langchain, chromadb, torch and the Gemini SDKs, so
+# they are only imported when a service is created or the class is asked for.
+def __getattr__(name):
+    if name == "LangChainRAG":
+        from .langchain_rag import LangChainRAG
+        return LangChainRAG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class RAGFactory:
     @staticmethod
     def create_rag_service(provider: str = "langchain", **kwargs) -> BaseRAG:
         provider = provider.lower()
+        api_key = kwargs.pop("api_key", None) or settings.GEMINI_API_KEY
+        model_name = kwargs.pop("model_name", None) or settings.MODEL_NAME
+        collection_name = kwargs.pop("collection_name", "academic_docs")
+        persist_directory = kwargs.pop("persist_directory", "./chroma_data")
+        embedding_model = kwargs.pop("embedding_model", "all-MiniLM-L6-v2")  # FIXED: Correct model name
+        embedding_backend = kwargs.pop("embedding_backend", None) or settings.EMBEDDING_BACKEND
 
-        if provider == "langchain":
-            api_key = kwargs.pop("api_key", None) or settings.GEMINI_API_KEY
-            model_name = kwargs.pop("model_name", None) or settings.MODEL_NAME
-            collection_name = kwargs.pop("collection_name", "academic_docs")
-            persist_directory = kwargs.pop("persist_directory", "./chroma_data")
-            embedding_model = kwargs.pop("embedding_model", "all-MiniLM-L6-v2")  # FIXED: Correct model name
-            
+        if provider in ("langchain", "fake"):
+            # "fake" is the LangChain service with a local canned-answer chat model
+            from .langchain_rag import LangChainRAG
+            if provider == "fake":
+                kwargs["llm_provider"] = "fake"
             return LangChainRAG(
                 api_key=api_key,
                 model_name=model_name,
                 collection_name=collection_name,
                 persist_directory=persist_directory,
                 embedding_model=embedding_model,
+                embedding_backend=embedding_backend,
                 **kwargs
             )
 
+        if provider == "chroma_gemini":
+            # Embedding weights come from the shared model registry, so this
+            # and a LangChain service for the same model share one copy
+            from .chroma_gemini_rag import ChromaGeminiRAG
+            return ChromaGeminiRAG(
+                api_key=api_key,
+                model_name=model_name,
+                collection_name=collection_name,
+                persist_directory=persist_directory,
+                embedding_model=embedding_model,
+                embedding_backend=embedding_backend
+            )
+
         raise ValueError(f"Unsupported RAG provider: {provider}")
\ No newline at end of file
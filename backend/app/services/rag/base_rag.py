@@ -1,7 +1,43 @@
 # backend/app/services/rag/base_rag.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Union
 from app.models.document import DocumentChunk
+from app.services.executor import run_blocking
+
+
+def document_filter(document_ids: Union[str, Sequence[str]]) -> Optional[Dict[str, Any]]:
+    """Chroma ``where`` clause limiting a search to one or more document ids"""
+    if isinstance(document_ids, str):
+        document_ids = [document_ids]
+    document_ids = list(dict.fromkeys(document_ids))
+    if not document_ids:
+        return None
+    if len(document_ids) == 1:
+        return {"document_id": document_ids[0]}
+    return {"document_id": {"$in": document_ids}}
+
+
+def fuse_results(
+    result_lists: Sequence[List[Dict[str, Any]]], limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Merge per-query results into one list ranked by score.
+
+    A chunk returned for several queries appears once, with its best score.
+    Chunks are matched on their text, so identical passages stored under
+    different ids are merged too; empty chunks are dropped.
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    for results in result_lists:
+        for result in results:
+            key = (result.get("text") or "").strip()
+            if not key:
+                continue
+            current = best.get(key)
+            if current is None or result.get("score", 0) > current.get("score", 0):
+                best[key] = result
+
+    fused = sorted(best.values(), key=lambda result: result.get("score", 0), reverse=True)
+    return fused[:limit] if limit is not None else fused
 
 class BaseRAG(ABC):
     @abstractmethod
@@ -17,4 +53,25 @@ class BaseRAG(ABC):
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate response"""
-        pass
\ No newline at end of file
+        pass
+
+    def search_many(self, queries: Sequence[str], k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Search several queries and return fused, deduplicated results ranked by score.
+
+        Accepts the same keyword arguments as ``search`` plus ``limit``.
+        Override to embed and query in one batch.
+        """
+        limit = kwargs.pop("limit", None)
+        return fuse_results([self.search(query, k, **kwargs) for query in queries], limit)
+
+    async def asearch(self, query: str, k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Search without blocking the event loop"""
+        return await run_blocking(self.search, query, k, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate without blocking the event loop; override for native async clients"""
+        return await run_blocking(self.generate, prompt, **kwargs)
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream the response in pieces; without native streaming it is one piece"""
+        yield await self.agenerate(prompt, **kwargs)
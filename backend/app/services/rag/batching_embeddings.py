@@ -0,0 +1,27 @@
+# backend/app/services/rag/batching_embeddings.py
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from app.services.embedding_batcher import QueryEmbeddingBatcher
+
+
+class QueryBatchingEmbeddings(Embeddings):
+    """LangChain embeddings whose ``embed_query`` calls share batched model runs."""
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.embeddings = embeddings
+        self.batcher = QueryEmbeddingBatcher(
+            embeddings.embed_documents,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.batcher.embed(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.embed_many(texts)
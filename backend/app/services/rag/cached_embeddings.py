@@ -0,0 +1,41 @@
+# backend/app/services/rag/cached_embeddings.py
+import logging
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from app.services.embedding_cache import EmbeddingCache
+from app.services.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings that check an EmbeddingCache before the wrapped model."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        record_cache("embedding", True, len(texts) - len(missing))
+        record_cache("embedding", False, len(missing))
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            self.cache.put_many([texts[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                cached[i] = vector
+
+        logger.debug(f"Embedded {len(texts)} texts ({len(texts) - len(missing)} cached)")
+        return [[float(x) for x in vector] for vector in cached]
+
+    def embed_query(self, text: str) -> List[float]:
+        cached = self.cache.get_many([text])[0]
+        record_cache("embedding", cached is not None)
+        if cached is not None:
+            return [float(x) for x in cached]
+
+        # Queries are not stored: the cache on disk is for document chunks
+        return self.embeddings.embed_query(text)
@@ -15,9 +15,10 @@ class ChromaGeminiRAG(ChromaRAG):
         model_name: str = None,
         collection_name: str = "academic_docs",
         persist_directory: str = "./chroma_data",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_backend: str = None
     ):
-        super().__init__(collection_name, persist_directory, embedding_model)
+        super().__init__(collection_name, persist_directory, embedding_model, embedding_backend)
         
         # Initialize Gemini
         self.model_name = model_name or settings.MODEL_NAME
@@ -37,6 +38,17 @@ class ChromaGeminiRAG(ChromaRAG):
             logger.error(error_msg, exc_info=True)
             return error_msg
 
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate response using Gemini's async client"""
+        try:
+            logger.info(f"Generating response (async) with prompt length: {len(prompt)}")
+            response = await self.model.generate_content_async(prompt)
+            return response.text
+        except Exception as e:
+            error_msg = f"Error in generation: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
+
     def add_documents(self, documents: List[DocumentChunk], **kwargs) -> bool:
         """Add documents using parent class method"""
         return super().add_documents(documents, **kwargs)
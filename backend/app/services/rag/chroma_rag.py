@@ -1,8 +1,10 @@
 # backend/app/services/rag/chroma_rag.py
 import chromadb
-from typing import List, Dict, Any, Optional
-from .base_rag import BaseRAG
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+from .base_rag import BaseRAG, fuse_results
+from app.config import settings
 from app.models.document import DocumentChunk
+from app.services.batching import iter_batches
 from app.services.embedding_service import EmbeddingService
 from chromadb.config import Settings
 import logging
@@ -14,7 +16,8 @@ class ChromaRAG(BaseRAG):
         self,
         collection_name: str = "academic_docs",
         persist_directory: str = "./chroma_data",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_backend: str = None
     ):
         self.client = chromadb.PersistentClient(
             path=persist_directory,
@@ -24,79 +27,134 @@ class ChromaRAG(BaseRAG):
             name=collection_name,
             metadata={"hnsw:space": "cosine"}
         )
-        self.embedding_service = EmbeddingService(embedding_model)
+        self.embedding_service = EmbeddingService(embedding_model, backend=embedding_backend)
         logger.info(f"Initialized ChromaRAG with collection: {collection_name}")
 
-    def add_documents(self, documents: List[DocumentChunk], **kwargs) -> bool:
-        """Add documents to ChromaDB with embeddings"""
+    def add_documents(self, documents: Iterable[DocumentChunk], **kwargs) -> bool:
+        """Add documents to ChromaDB with embeddings, one batch at a time"""
         try:
-            if not documents:
+            batch_size = kwargs.get("batch_size", settings.INGEST_BATCH_SIZE)
+            try:
+                batch_size = min(batch_size, self.client.get_max_batch_size())
+            except AttributeError:
+                pass
+
+            added = 0
+            for batch in iter_batches(documents, max(1, batch_size)):
+                # Generate embeddings for this batch
+                texts = [doc.text for doc in batch]
+                embeddings = self.embedding_service.create_embeddings(texts)
+
+                # Create unique IDs
+                ids = [f"{doc.document_id}_{doc.metadata.get('chunk_index', 0)}" for doc in batch]
+
+                # Prepare metadata
+                metadatas = []
+                for doc in batch:
+                    metadata = doc.metadata.copy() if doc.metadata else {}
+                    metadata.update({
+                        "document_id": doc.document_id,
+                        "chunk_index": metadata.get("chunk_index", 0)
+                    })
+                    metadatas.append(metadata)
+
+                # Add to ChromaDB
+                self.collection.upsert(
+                    ids=ids,
+                    embeddings=embeddings.tolist(),
+                    documents=texts,
+                    metadatas=metadatas
+                )
+                added += len(batch)
+
+            if not added:
                 return False
 
-            # Generate embeddings for all documents
-            texts = [doc.text for doc in documents]
-            embeddings = self.embedding_service.create_embeddings(texts)
-            
-            # Create unique IDs
-            ids = [f"{doc.document_id}_{doc.metadata.get('chunk_index', 0)}" for doc in documents]
-            
-            # Prepare metadata
-            metadatas = []
-            for doc in documents:
-                metadata = doc.metadata.copy() if doc.metadata else {}
-                metadata.update({
-                    "document_id": doc.document_id,
-                    "chunk_index": metadata.get("chunk_index", 0)
-                })
-                metadatas.append(metadata)
-
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings.tolist(),
-                documents=texts,
-                metadatas=metadatas
-            )
-            
-            logger.info(f"Added {len(documents)} documents to ChromaDB")
+            logger.info(f"Added {added} documents to ChromaDB")
             return True
             
         except Exception as e:
             logger.error(f"Error adding documents to ChromaDB: {str(e)}", exc_info=True)
             return False
 
+    def get_document_chunk_count(self, document_id: str) -> int:
+        """Return how many chunks are stored for a document id"""
+        try:
+            existing = self.collection.get(where={"document_id": document_id}, include=[])
+            return len(existing["ids"])
+        except Exception as e:
+            logger.error(f"Error looking up document {document_id}: {str(e)}")
+            return 0
+
     def search(self, query: str, k: int = 5, **kwargs) -> List[Dict[str, Any]]:
-        """Search for relevant document chunks using semantic similarity"""
+        """Search for relevant document chunks using semantic similarity
+
+        Pass ``filters`` (a ChromaDB ``where`` clause, see ``document_filter``)
+        to restrict the search.
+        """
         try:
             # Generate query embedding
-            query_embedding = self.embedding_service.create_embeddings([query])
+            query_embedding = self.embedding_service.embed_query(query)
             
             # Search in ChromaDB
             results = self.collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=k
+                query_embeddings=[query_embedding.tolist()],
+                n_results=k,
+                where=kwargs.get("filters") or None
             )
             
-            # Format results
-            chunks = []
-            documents = results.get('documents', [[]])[0]
-            metadatas = results.get('metadatas', [[]])[0]
-            distances = results.get('distances', [[]])[0]
+            chunks = self._format_results(results)[0]
+            logger.info(f"Found {len(chunks)} relevant chunks for query")
+            return chunks
             
+        except Exception as e:
+            logger.error(f"Error searching ChromaDB: {str(e)}", exc_info=True)
+            return []
+
+    def search_many(self, queries: Sequence[str], k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Search several queries with one embedding batch and one ChromaDB query.
+
+        Returns the fused results, deduplicated and ranked by score; pass
+        ``limit`` to cap how many are returned and ``filters`` as for ``search``.
+        """
+        if not queries:
+            return []
+        try:
+            query_embeddings = self.embedding_service.create_embeddings(list(queries))
+            results = self.collection.query(
+                query_embeddings=query_embeddings.tolist(),
+                n_results=k,
+                where=kwargs.get("filters") or None
+            )
+
+            chunks = fuse_results(self._format_results(results), kwargs.get("limit"))
+            logger.info(f"Found {len(chunks)} unique chunks for {len(queries)} queries")
+            return chunks
+
+        except Exception as e:
+            logger.error(f"Error searching ChromaDB: {str(e)}", exc_info=True)
+            return []
+
+    def _format_results(self, results: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+        """Turn a ChromaDB query response into one list of chunks per query"""
+        all_chunks = []
+        for ids, documents, metadatas, distances in zip(
+            results.get('ids', [[]]),
+            results.get('documents', [[]]),
+            results.get('metadatas', [[]]),
+            results.get('distances', [[]])
+        ):
+            chunks = []
             for i in range(len(documents)):
                 chunks.append({
+                    "id": ids[i],
                     "text": documents[i],
                     "metadata": metadatas[i],
                     "score": 1 - distances[i],  # Convert cosine distance to similarity
                     "document_id": metadatas[i].get("document_id", "")
                 })
-            
-            logger.info(f"Found {len(chunks)} relevant chunks for query")
-            return chunks
-            
-        except Exception as e:
-            logger.error(f"Error searching ChromaDB: {str(e)}", exc_info=True)
-            return []
+            all_chunks.append(chunks)
+        return all_chunks
 
     def generate(self, prompt: str, **kwargs) -> str:
         """This method will be implemented by the child class"""
@@ -106,9 +164,11 @@ class ChromaRAG(BaseRAG):
         """Get statistics about the collection"""
         try:
             count = self.collection.count()
+            cache = self.embedding_service.cache
             return {
                 "total_documents": count,
-                "collection_name": self.collection.name
+                "collection_name": self.collection.name,
+                "embedding_cache": cache.stats() if cache else None
             }
         except Exception as e:
             logger.error(f"Error getting collection stats: {str(e)}")
@@ -1,15 +1,23 @@
 # backend/app/services/rag/langchain_rag.py
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Iterable, Optional, Sequence, Tuple
 from app.models.document import DocumentChunk
 from app.config import settings
-
-# LangChain imports
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
-from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.services.batching import iter_batches
+from app.services.embedding_backends import cache_model_key
+from app.services.embedding_cache import EmbeddingCache
+from app.services.executor import run_blocking
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_client import CircuitBreaker, LLMError, ResilientLLMClient
+from app.services.metrics import record_cache, record_payload, stage
+from app.services.model_registry import model_registry
+from app.services.retrieval_cache import RetrievalCache
+from app.services.semantic_cache import SemanticCache
+from .base_rag import fuse_results
+from .batching_embeddings import QueryBatchingEmbeddings
+from .cached_embeddings import CachedEmbeddings
+from .sentence_transformer_embeddings import SentenceTransformerEmbeddings
 
 logger = logging.getLogger(__name__)
 
@@ -20,27 +28,91 @@ class LangChainRAG:
         model_name: str = None,
         collection_name: str = "academic_docs",
         persist_directory: str = "./chroma_data",
-        embedding_model: str = "all-MiniLM-L6-v2"  # FIXED: Correct HuggingFace model name
+        embedding_model: str = "all-MiniLM-L6-v2",  # FIXED: Correct HuggingFace model name
+        embedding_backend: str = "torch",
+        llm_provider: str = None
     ):
-        self.model_name = model_name or settings.MODEL_NAME
+        self.llm_provider = (llm_provider or settings.LLM_PROVIDER).lower()
+        self.model_name = "fake" if self.llm_provider == "fake" else (model_name or settings.MODEL_NAME)
         self.collection_name = collection_name
         self.persist_directory = persist_directory
         self.embedding_model_name = embedding_model
+        self.embedding_backend = embedding_backend
+
+        # LangChain imports (deferred so importing this module stays cheap)
+        from langchain_chroma import Chroma
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
         
         # Initialize LangChain components
-        self.llm = ChatGoogleGenerativeAI(
-            model=self.model_name,
-            google_api_key=api_key,
-            temperature=0.1
+        self.temperature = 0.1
+        self.llm = self._create_llm(api_key)
+
+        # Every LLM call goes through the quota-aware client
+        self.llm_client = ResilientLLMClient(
+            self.llm,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_retries=settings.LLM_MAX_RETRIES,
+            backoff_base_seconds=settings.LLM_BACKOFF_BASE_SECONDS,
+            backoff_max_seconds=settings.LLM_BACKOFF_MAX_SECONDS,
+            max_queue_seconds=settings.LLM_MAX_QUEUE_SECONDS,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+            )
         )
+
+        self.llm_cache = None
+        if settings.LLM_CACHE_ENABLED:
+            self.llm_cache = LLMResponseCache(
+                settings.LLM_CACHE_PATH,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES
+            )
         
-        # Use local HuggingFace embeddings (no API limits)
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=embedding_model,
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True}
+        # Use local CPU embeddings (no API limits)
+        self.embeddings = SentenceTransformerEmbeddings(
+            model_registry.get(embedding_model, embedding_backend, settings.EMBEDDING_ONNX_FILE),
+            normalize_embeddings=True
         )
+        self.query_batcher = None
+        if settings.QUERY_BATCHING_ENABLED:
+            self.embeddings = QueryBatchingEmbeddings(
+                self.embeddings,
+                max_batch_size=settings.QUERY_BATCH_MAX_SIZE,
+                max_wait_ms=settings.QUERY_BATCH_MAX_WAIT_MS
+            )
+            self.query_batcher = self.embeddings.batcher
+        # Queries skip the persistent embedding cache below; their vectors
+        # are kept by the retrieval cache instead
+        self.query_embeddings = self.embeddings
+
+        self.embedding_cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            # Normalized vectors differ from EmbeddingService's, so cache them apart
+            self.embedding_cache = EmbeddingCache(
+                settings.EMBEDDING_CACHE_DIR,
+                f"{cache_model_key(embedding_model, embedding_backend)}-normalized",
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+            )
+            self.embeddings = CachedEmbeddings(self.embeddings, self.embedding_cache)
         
+        self.retrieval_cache = None
+        if settings.RETRIEVAL_CACHE_ENABLED:
+            self.retrieval_cache = RetrievalCache(
+                max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+                shared_path=settings.RETRIEVAL_CACHE_SHARED_PATH
+            )
+
+        self.semantic_cache = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache = SemanticCache(
+                self.query_embeddings.embed_query,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+            )
+
         # Initialize Chroma vector store
         try:
             self.vectorstore = Chroma(
@@ -66,30 +138,78 @@ class LangChainRAG:
         
         logger.info(f"Initialized LangChainRAG with model: {self.model_name}")
         logger.info(f"Using collection: {collection_name}")
-        logger.info(f"Embedding model: {embedding_model} (local)")
+        logger.info(f"Embedding model: {embedding_model} (local, {embedding_backend} backend)")
         logger.info(f"Persist directory: {persist_directory}")
 
-    def add_documents(self, documents: List[DocumentChunk], **kwargs) -> bool:
-        """Add documents to Chroma using LangChain"""
+    def _create_llm(self, api_key: str):
+        """Chat model for ``llm_provider``, wrapped for record/replay if configured"""
+        if self.llm_provider == "fake":
+            from app.services.fake_llm import FakeChatModel
+            llm = FakeChatModel(
+                latency_seconds=settings.FAKE_LLM_LATENCY_SECONDS,
+                tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND
+            )
+        elif self.llm_provider == "gemini":
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            llm = ChatGoogleGenerativeAI(
+                model=self.model_name,
+                google_api_key=api_key,
+                temperature=self.temperature
+            )
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+
+        self.record_replay = None
+        if settings.LLM_RECORD_REPLAY_MODE:
+            from app.services.record_replay_llm import RecordReplayLLM
+            llm = self.record_replay = RecordReplayLLM(
+                llm,
+                settings.LLM_RECORDINGS_PATH,
+                mode=settings.LLM_RECORD_REPLAY_MODE,
+                namespace=f"{self.model_name}\n{self.temperature}",
+                speed=settings.LLM_REPLAY_SPEED
+            )
+        return llm
+
+    def add_documents(self, documents: Iterable[DocumentChunk], **kwargs) -> bool:
+        """Add documents to Chroma using LangChain
+
+        ``documents`` may be any iterable, e.g. ``DocumentProcessor.iter_chunks``;
+        it is consumed ``batch_size`` chunks at a time so memory stays flat.
+        Pass ``progress_callback(stage, count)`` to be told the running number
+        of chunks embedded (stage ``"embedded"``) and written (``"written"``).
+        """
+        progress_callback = kwargs.get("progress_callback")
+        batch_size = self._write_batch_size(kwargs.get("batch_size", settings.INGEST_BATCH_SIZE))
+        document_ids = set()
         try:
-            # Convert DocumentChunk to LangChain Document
-            langchain_docs = []
-            for doc_chunk in documents:
-                metadata = doc_chunk.metadata.copy()
-                metadata.update({
-                    "document_id": doc_chunk.document_id,
-                    "chunk_index": metadata.get("chunk_index", 0)
-                })
-                
-                langchain_doc = Document(
-                    page_content=doc_chunk.text,
-                    metadata=metadata
-                )
-                langchain_docs.append(langchain_doc)
-            
-            # Add to vector store
-            self.vectorstore.add_documents(langchain_docs)
-            logger.info(f"Added {len(langchain_docs)} documents to LangChain Chroma")
+            embedded = 0
+            written = 0
+            for batch in iter_batches(documents, batch_size):
+                texts = [doc_chunk.text for doc_chunk in batch]
+                metadatas = [self._chunk_metadata(doc_chunk) for doc_chunk in batch]
+                document_ids.update(m["document_id"] for m in metadatas)
+
+                # Embed and write as separate steps so callers can track progress
+                with stage("embed"):
+                    embeddings = self.embeddings.embed_documents(texts)
+                embedded += len(texts)
+                if progress_callback:
+                    progress_callback("embedded", embedded)
+
+                # Deterministic ids make re-adding the same document idempotent
+                with stage("write"):
+                    self.vectorstore._collection.upsert(
+                        ids=[f"{m['document_id']}_{m['chunk_index']}" for m in metadatas],
+                        embeddings=embeddings,
+                        documents=texts,
+                        metadatas=metadatas
+                    )
+                written += len(texts)
+                if progress_callback:
+                    progress_callback("written", written)
+
+            logger.info(f"Added {written} documents to LangChain Chroma")
             return True
             
         except Exception as e:
@@ -97,21 +217,271 @@ class LangChainRAG:
             logger.error(error_msg, exc_info=True)
             return False
 
+        finally:
+            self._invalidate_caches(document_ids)
+
+    def reingest_document(
+        self, document_name: str, documents: Iterable[DocumentChunk], **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """Replace the stored chunks of a named document with a new version.
+
+        Chunks are matched on a SHA-256 of their text. Only new or changed
+        chunks are embedded; unchanged ones just get their metadata updated
+        and chunks missing from the new version are deleted. Both happen
+        once the whole new version is written, so a failure part way
+        through leaves the old version intact under its own document id
+        (the caller removes the new id's partial chunks). Returns counts
+        of added, unchanged and deleted chunks plus ``replaced_document_ids``,
+        the old ids no chunk carries any more, or None on failure.
+        """
+        progress_callback = kwargs.get("progress_callback")
+        batch_size = self._write_batch_size(kwargs.get("batch_size", settings.INGEST_BATCH_SIZE))
+        collection = self.vectorstore._collection
+        document_ids = set()
+        new_document_ids = set()
+        old_metadatas: Dict[str, Dict[str, Any]] = {}
+        relabeled_ids: List[str] = []
+        try:
+            existing = collection.get(
+                where={"document_name": document_name},
+                include=["metadatas"]
+            )
+            stored: Dict[str, List[str]] = {}
+            for chunk_id, metadata in zip(existing["ids"], existing["metadatas"]):
+                stored.setdefault(metadata.get("chunk_hash"), []).append(chunk_id)
+                document_ids.add(metadata.get("document_id"))
+                old_metadatas[chunk_id] = metadata
+
+            added = 0
+            written_ids = set()
+            kept_ids, kept_metadatas = [], []
+            for batch in iter_batches(documents, batch_size):
+                new_texts, new_metadatas = [], []
+                for doc_chunk in batch:
+                    metadata = self._chunk_metadata(doc_chunk)
+                    metadata["document_name"] = document_name
+                    document_ids.add(metadata["document_id"])
+                    new_document_ids.add(metadata["document_id"])
+                    metadata["chunk_hash"] = hashlib.sha256(doc_chunk.text.encode("utf-8")).hexdigest()
+
+                    matching_ids = stored.get(metadata["chunk_hash"])
+                    if matching_ids:
+                        kept_ids.append(matching_ids.pop())
+                        kept_metadatas.append(metadata)
+                    else:
+                        new_texts.append(doc_chunk.text)
+                        new_metadatas.append(metadata)
+
+                if new_texts:
+                    new_ids = [f"{m['document_id']}_{m['chunk_index']}" for m in new_metadatas]
+                    embeddings = self.embeddings.embed_documents(new_texts)
+                    added += len(new_texts)
+                    if progress_callback:
+                        progress_callback("embedded", added)
+
+                    collection.upsert(
+                        ids=new_ids,
+                        embeddings=embeddings,
+                        documents=new_texts,
+                        metadatas=new_metadatas
+                    )
+                    written_ids.update(new_ids)
+
+                if progress_callback:
+                    progress_callback("written", added + len(kept_ids))
+
+            # The new version is complete: move unchanged chunks over to it
+            unchanged = len(kept_ids)
+            for start in range(0, unchanged, batch_size):
+                batch_ids = kept_ids[start:start + batch_size]
+                collection.update(ids=batch_ids, metadatas=kept_metadatas[start:start + batch_size])
+                relabeled_ids.extend(batch_ids)
+            written_ids.update(kept_ids)
+
+            # Whatever was not matched disappeared from the new version
+            stale_ids = [
+                chunk_id for ids in stored.values() for chunk_id in ids
+                if chunk_id not in written_ids
+            ]
+            for batch in iter_batches(stale_ids, batch_size):
+                collection.delete(ids=batch)
+
+            logger.info(
+                f"Re-ingested '{document_name}': {added} added, {unchanged} unchanged, "
+                f"{len(stale_ids)} deleted"
+            )
+            return {
+                "added": added,
+                "unchanged": unchanged,
+                "deleted": len(stale_ids),
+                # Every old chunk was relabeled or deleted, so these ids are gone
+                "replaced_document_ids": sorted(document_ids - new_document_ids - {None}),
+            }
+
+        except Exception as e:
+            logger.error(f"Error re-ingesting document '{document_name}': {str(e)}", exc_info=True)
+            self._restore_metadata(relabeled_ids, old_metadatas, batch_size)
+            return None
+
+        finally:
+            self._invalidate_caches(document_ids)
+
+    def link_document_name(self, document_name: str, document_id: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Point ``document_name`` at the already stored ``document_id``.
+
+        For an upload under a name whose content is already indexed: its
+        chunks take the name (and a ``chunk_hash``, so the next version can
+        be diffed against them) and the name's previous version is deleted,
+        as a re-ingest would. Returns the deleted chunk count and
+        ``replaced_document_ids`` like ``reingest_document``, or None on failure.
+        """
+        batch_size = self._write_batch_size(kwargs.get("batch_size", settings.INGEST_BATCH_SIZE))
+        collection = self.vectorstore._collection
+        document_ids = {document_id}
+        try:
+            previous = collection.get(where={"document_name": document_name}, include=["metadatas"])
+            stale_ids = [
+                chunk_id for chunk_id, metadata in zip(previous["ids"], previous["metadatas"])
+                if metadata.get("document_id") != document_id
+            ]
+            document_ids.update(metadata.get("document_id") for metadata in previous["metadatas"])
+
+            current = collection.get(where={"document_id": document_id}, include=["metadatas", "documents"])
+            metadatas = []
+            for metadata, text in zip(current["metadatas"], current["documents"]):
+                metadata = dict(metadata)
+                metadata["document_name"] = document_name
+                metadata["chunk_hash"] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                metadatas.append(metadata)
+            for start in range(0, len(metadatas), batch_size):
+                collection.update(
+                    ids=current["ids"][start:start + batch_size], metadatas=metadatas[start:start + batch_size]
+                )
+            for batch in iter_batches(stale_ids, batch_size):
+                collection.delete(ids=batch)
+
+            logger.info(
+                f"Linked '{document_name}' to stored document {document_id}; {len(stale_ids)} old chunks deleted"
+            )
+            return {
+                "deleted": len(stale_ids),
+                "replaced_document_ids": sorted(document_ids - {document_id, None}),
+            }
+
+        except Exception as e:
+            logger.error(f"Error linking '{document_name}' to document {document_id}: {str(e)}", exc_info=True)
+            return None
+
+        finally:
+            self._invalidate_caches(document_ids)
+
+    def _restore_metadata(
+        self, chunk_ids: List[str], metadatas: Dict[str, Dict[str, Any]], batch_size: int
+    ) -> None:
+        """Put back the metadata chunks had before a failed re-ingest relabeled them"""
+        try:
+            for start in range(0, len(chunk_ids), batch_size):
+                batch_ids = chunk_ids[start:start + batch_size]
+                self.vectorstore._collection.update(
+                    ids=batch_ids, metadatas=[metadatas[chunk_id] for chunk_id in batch_ids]
+                )
+        except Exception as e:
+            logger.error(f"Could not restore the metadata of {len(chunk_ids)} chunks: {str(e)}", exc_info=True)
+
+    def _invalidate_caches(self, document_ids: Iterable[str] = ()) -> None:
+        """Forget cached results that a write to these documents may have changed"""
+        if self.retrieval_cache:
+            self.retrieval_cache.bump(self.collection_name)
+        if self.semantic_cache:
+            self.semantic_cache.invalidate_documents(document_ids)
+
+    def _chunk_metadata(self, doc_chunk: DocumentChunk) -> Dict[str, Any]:
+        metadata = (doc_chunk.metadata or {}).copy()
+        metadata.update({
+            "document_id": doc_chunk.document_id,
+            "chunk_index": metadata.get("chunk_index", 0)
+        })
+        return metadata
+
+    def _write_batch_size(self, batch_size: int) -> int:
+        """Clamp a batch size to the largest write Chroma accepts"""
+        client = self.vectorstore._client
+        try:
+            max_batch_size = client.get_max_batch_size()
+        except AttributeError:
+            max_batch_size = getattr(client, "max_batch_size", batch_size)
+        return max(1, min(batch_size, max_batch_size))
+
+    def delete_document(self, document_id: str) -> int:
+        """Delete every stored chunk of a document id and return how many there were"""
+        try:
+            collection = self.vectorstore._collection
+            ids = collection.get(where={"document_id": document_id}, include=[])["ids"]
+            for batch in iter_batches(ids, 500):
+                collection.delete(ids=batch)
+            logger.info(f"Deleted {len(ids)} chunks of document {document_id}")
+            return len(ids)
+
+        except Exception as e:
+            logger.error(f"Error deleting document {document_id}: {str(e)}", exc_info=True)
+            return 0
+
+        finally:
+            self._invalidate_caches([document_id])
+
+    def get_document_chunk_count(self, document_id: str) -> int:
+        """Return how many chunks are stored for a document id"""
+        try:
+            existing = self.vectorstore._collection.get(
+                where={"document_id": document_id},
+                include=[]
+            )
+            return len(existing["ids"])
+
+        except Exception as e:
+            logger.error(f"Error looking up document {document_id}: {str(e)}")
+            return 0
+
+    def get_document_chunks(self, document_id: str) -> List[str]:
+        """Return the text of every chunk stored for a document, in document order"""
+        existing = self.vectorstore._collection.get(
+            where={"document_id": document_id},
+            include=["documents", "metadatas"]
+        )
+        ordered = sorted(
+            zip(existing["metadatas"], existing["documents"]),
+            key=lambda item: item[0].get("chunk_index", 0)
+        )
+        return [text for _, text in ordered]
+
     def search(self, query: str, k: int = 5, **kwargs) -> List[Dict[str, Any]]:
-        """Search for relevant documents using LangChain"""
+        """Search for relevant documents using LangChain
+
+        Pass ``filters`` (a Chroma ``where`` clause, see ``document_filter``)
+        to restrict the search, e.g. to the chunks of one document.
+        Results and query vectors are served from the retrieval cache when
+        nothing has been written to the collection since they were stored.
+        """
+        filters = kwargs.get("filters")
         try:
-            # Perform similarity search
-            docs = self.vectorstore.similarity_search(query, k=k)
-            
-            # Convert to expected format
-            results = []
-            for doc in docs:
-                results.append({
-                    "text": doc.page_content,
-                    "metadata": doc.metadata,
-                    "score": 0.0  # LangChain doesn't provide scores by default
-                })
-            
+            with stage("retrieve"):
+                version = None
+                if self.retrieval_cache:
+                    # Read once: a write landing during the query must not
+                    # file these results under its new version
+                    version = self.retrieval_cache.version(self.collection_name)
+                    cached = self.retrieval_cache.get_results(self.collection_name, query, k, filters, version)
+                    record_cache("retrieval", cached is not None)
+                    if cached is not None:
+                        logger.info(f"LangChain search served {len(cached)} cached results for query: {query}")
+                        return cached
+
+                query_embedding = self._embed_query(query)
+                results = self._query_collection([query_embedding], k, filters)[0]
+
+                if self.retrieval_cache:
+                    self.retrieval_cache.put_results(self.collection_name, query, k, filters, results, version)
+
             logger.info(f"LangChain search found {len(results)} results for query: {query}")
             return results
             
@@ -120,20 +490,235 @@ class LangChainRAG:
             logger.error(error_msg, exc_info=True)
             return []
 
+    def search_many(self, queries: Sequence[str], k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Search several queries at once and fuse the results
+
+        Uncached queries are embedded in one batch and sent to Chroma as a
+        single multi-query lookup. Results are deduplicated by chunk text and
+        ranked by score; pass ``limit`` to cap how many are returned and
+        ``filters`` as for ``search``.
+        """
+        filters = kwargs.get("filters")
+        try:
+            with stage("retrieve"):
+                per_query: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+                version = None
+                if self.retrieval_cache:
+                    version = self.retrieval_cache.version(self.collection_name)
+                    for i, query in enumerate(queries):
+                        per_query[i] = self.retrieval_cache.get_results(
+                            self.collection_name, query, k, filters, version
+                        )
+
+                pending = [i for i, results in enumerate(per_query) if results is None]
+                if self.retrieval_cache:
+                    record_cache("retrieval", True, len(queries) - len(pending))
+                    record_cache("retrieval", False, len(pending))
+                if pending:
+                    query_embeddings = self._embed_queries([queries[i] for i in pending])
+                    for i, results in zip(pending, self._query_collection(query_embeddings, k, filters)):
+                        per_query[i] = results
+                        if self.retrieval_cache:
+                            self.retrieval_cache.put_results(
+                                self.collection_name, queries[i], k, filters, results, version
+                            )
+
+                results = fuse_results(per_query, kwargs.get("limit"))
+            logger.info(
+                f"LangChain search found {len(results)} unique results for {len(queries)} queries "
+                f"({len(queries) - len(pending)} cached)"
+            )
+            return results
+
+        except Exception as e:
+            error_msg = f"Error in LangChain search: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return []
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries; uncached ones go through the query batcher, or one model call without it"""
+        vectors: List[Optional[List[float]]] = [None] * len(queries)
+        if self.retrieval_cache:
+            for i, query in enumerate(queries):
+                vectors[i] = self.retrieval_cache.get_vector(self.collection_name, query)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if self.retrieval_cache:
+            record_cache("query_vector", True, len(queries) - len(missing))
+            record_cache("query_vector", False, len(missing))
+        if missing:
+            with stage("embed_query"):
+                texts = [queries[i] for i in missing]
+                if self.query_batcher:
+                    computed = self.query_embeddings.embed_queries(texts)
+                else:
+                    computed = self.query_embeddings.embed_documents(texts)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                if self.retrieval_cache:
+                    self.retrieval_cache.put_vector(self.collection_name, queries[i], vector)
+        return vectors
+
+    def _embed_query(self, query: str) -> List[float]:
+        if self.retrieval_cache:
+            vector = self.retrieval_cache.get_vector(self.collection_name, query)
+            record_cache("query_vector", vector is not None)
+            if vector is not None:
+                return vector
+
+        with stage("embed_query"):
+            vector = self.query_embeddings.embed_query(query)
+        if self.retrieval_cache:
+            self.retrieval_cache.put_vector(self.collection_name, query, vector)
+        return vector
+
+    def _query_collection(
+        self, query_embeddings: List[List[float]], k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run a vector query and return one result list per query embedding"""
+        collection = self.vectorstore._collection
+        with stage("vector_query"):
+            response = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                where=filters or None,
+                include=["documents", "metadatas", "distances"]
+            )
+
+        # Turn distances into a similarity where higher is better
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+        all_results = []
+        for ids, texts, metadatas, distances in zip(
+            response["ids"], response["documents"], response["metadatas"], response["distances"]
+        ):
+            results = []
+            for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances):
+                if space == "l2":
+                    # Embeddings are normalized, so squared L2 = 2 - 2 * cosine
+                    score = 1 - distance / 2
+                else:
+                    score = 1 - distance
+                results.append({
+                    "id": chunk_id,
+                    "text": text,
+                    "metadata": metadata,
+                    "score": score
+                })
+            all_results.append(results)
+        return all_results
+
+    def warmup(self) -> None:
+        """Load the embedding model and open the collection before real traffic"""
+        query_embedding = self.query_embeddings.embed_query("warmup")
+        self._query_collection([query_embedding], k=1)
+
+    def _cached_response(self, prompt: str, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached response) honouring the per-call cache flags.
+
+        ``use_cache=False`` skips the cache entirely (key is None);
+        ``refresh_cache=True`` ignores any stored response but saves the new one.
+        """
+        if self.llm_cache is None:
+            return None, None
+        if not kwargs.get("use_cache", True):
+            self.llm_cache.record_bypass()
+            return None, None
+
+        key = LLMResponseCache.key(self.model_name, self.temperature, prompt)
+        if kwargs.get("refresh_cache", False):
+            self.llm_cache.record_bypass()
+            return key, None
+        cached = self.llm_cache.get(key)
+        record_cache("llm", cached is not None)
+        return key, cached
+
     def generate(self, prompt: str, **kwargs) -> str:
-        """Generate response using LangChain LLM"""
+        """Generate response using LangChain LLM
+
+        Accepts ``use_cache`` and ``refresh_cache`` when the LLM cache is enabled.
+        Quota and availability failures raise LLMRateLimitError or
+        LLMUnavailableError; other failures come back as an error string
+        unless ``raise_errors=True``.
+        """
         try:
+            cache_key, cached = self._cached_response(prompt, **kwargs)
+            if cached is not None:
+                logger.info("LangChain response served from LLM cache")
+                return cached
+
             logger.info(f"LangChain generating response with prompt length: {len(prompt)}")
             
             # Simple invocation for direct prompts
-            response = self.llm.invoke(prompt)
+            record_payload("prompt", prompt)
+            with stage("llm"):
+                response = self.llm_client.invoke(prompt)
+            record_payload("response", response.content)
+            if cache_key is not None:
+                self.llm_cache.put(cache_key, response.content)
             return response.content
             
+        except LLMError:
+            raise
+        except Exception as e:
+            if kwargs.get("raise_errors"):
+                raise
+            error_msg = f"Error in LangChain generation: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return error_msg
+
+    async def asearch(self, query: str, k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Async search: the embedding and vector query run on the bounded pool"""
+        return await run_blocking(self.search, query, k, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        """Generate response using the LLM's native async invoke"""
+        try:
+            cache_key, cached = await run_blocking(self._cached_response, prompt, **kwargs)
+            if cached is not None:
+                logger.info("LangChain response served from LLM cache")
+                return cached
+
+            logger.info(f"LangChain generating response (async) with prompt length: {len(prompt)}")
+            record_payload("prompt", prompt)
+            with stage("llm"):
+                response = await self.llm_client.ainvoke(prompt)
+            record_payload("response", response.content)
+            if cache_key is not None:
+                await run_blocking(self.llm_cache.put, cache_key, response.content)
+            return response.content
+
+        except LLMError:
+            raise
         except Exception as e:
+            if kwargs.get("raise_errors"):
+                raise
             error_msg = f"Error in LangChain generation: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return error_msg
 
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Yield response text as the LLM produces it
+
+        A cached response is yielded as a single piece; a completed stream is cached.
+        """
+        cache_key, cached = await run_blocking(self._cached_response, prompt, **kwargs)
+        if cached is not None:
+            logger.info("LangChain response served from LLM cache")
+            yield cached
+            return
+
+        logger.info(f"LangChain streaming response with prompt length: {len(prompt)}")
+        pieces = []
+        record_payload("prompt", prompt)
+        with stage("llm_stream"):
+            async for chunk in self.llm_client.astream(prompt):
+                if chunk.content:
+                    pieces.append(chunk.content)
+                    yield chunk.content
+        record_payload("response", "".join(pieces))
+        if cache_key is not None:
+            await run_blocking(self.llm_cache.put, cache_key, "".join(pieces))
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection"""
         try:
@@ -146,7 +731,16 @@ class LangChainRAG:
                 "document_count": count,
                 "persist_directory": self.persist_directory,
                 "embedding_model": self.embedding_model_name,
-                "llm_model": self.model_name
+                "embedding_backend": self.embedding_backend,
+                "llm_model": self.model_name,
+                "embedding_cache": self.embedding_cache.stats() if self.embedding_cache else None,
+                "query_batching": self.query_batcher.stats() if self.query_batcher else None,
+                "retrieval_cache": self.retrieval_cache.stats() if self.retrieval_cache else None,
+                "llm_cache": self.llm_cache.stats() if self.llm_cache else None,
+                "semantic_cache": self.semantic_cache.stats() if self.semantic_cache else None,
+                "llm_client": self.llm_client.stats(),
+                "llm_provider": self.llm_provider,
+                "record_replay": self.record_replay.stats() if self.record_replay else None
             }
             
         except Exception as e:
@@ -176,7 +770,7 @@ Question: {query}
 
 Please provide a comprehensive answer based only on the given context."""
             
-            response = self.llm.invoke(prompt)
+            response = self.llm_client.invoke(prompt)
             return response.content
             
         except Exception as e:
@@ -0,0 +1,29 @@
+# backend/app/services/rag/sentence_transformer_embeddings.py
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """LangChain embeddings over an already-loaded SentenceTransformer.
+
+    Mirrors HuggingFaceEmbeddings (newlines flattened, optional normalization)
+    so vectors stay comparable with ones already stored in Chroma, but accepts
+    models from any backend in ``embedding_backends``.
+    """
+
+    def __init__(self, model, normalize_embeddings: bool = True):
+        self.model = model
+        self.normalize_embeddings = normalize_embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        embeddings = self.model.encode(
+            texts,
+            normalize_embeddings=self.normalize_embeddings,
+            show_progress_bar=False
+        )
+        return embeddings.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
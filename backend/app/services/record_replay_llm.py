@@ -0,0 +1,155 @@
+# backend/app/services/record_replay_llm.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.services.fake_llm import FakeMessage
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay")
+
+
+class ReplayMissError(LookupError):
+    """Replay mode was asked for a prompt that was never recorded."""
+
+
+def _content(message: Any) -> str:
+    content = getattr(message, "content", message)
+    return content if isinstance(content, str) else str(content)
+
+
+class RecordReplayLLM:
+    """Wraps a chat model to record prompt -> response pairs or replay them.
+
+    In "record" mode every call goes to ``llm`` and the response is appended
+    to a JSON Lines file together with its timing (time to first chunk, total
+    time, and the chunks of streamed calls). In "replay" mode ``llm`` is never
+    called: responses come from the file and are delivered with the recorded
+    timing scaled by ``speed`` (0 = no delay). Prompts are keyed by
+    ``namespace`` (usually the model name) and prompt text.
+    """
+
+    def __init__(self, llm, path: str, mode: str = "replay", namespace: str = "", speed: float = 1.0):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported record/replay mode: {mode}")
+        self.llm = llm
+        self.path = path
+        self.mode = mode
+        self.namespace = namespace
+        self.speed = speed
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, Dict[str, Any]] = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        # Later recordings of the same prompt win
+                        self._recordings[entry["key"]] = entry
+        logger.info(f"Initialized RecordReplayLLM ({mode}) with {len(self._recordings)} recordings from {path}")
+
+    def key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\n{prompt}".encode("utf-8")).hexdigest()
+
+    # ------------------ storage ------------------
+
+    def _record(self, prompt: str, chunks: List[str], first_chunk_seconds: float, total_seconds: float) -> None:
+        entry = {
+            "key": self.key(prompt),
+            "namespace": self.namespace,
+            "prompt_chars": len(prompt),
+            "response": "".join(chunks),
+            "chunks": chunks,
+            "first_chunk_seconds": round(first_chunk_seconds, 4),
+            "total_seconds": round(total_seconds, 4),
+            "recorded_at": time.time(),
+        }
+        with self._lock:
+            self._recordings[entry["key"]] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.recorded += 1
+
+    def _lookup(self, prompt: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._recordings.get(self.key(prompt))
+            if entry is None:
+                self.misses += 1
+                raise ReplayMissError(
+                    f"No recorded response for this prompt ({len(prompt)} chars) in {self.path}"
+                )
+            self.hits += 1
+            return entry
+
+    # ------------------ calls ------------------
+
+    def invoke(self, prompt: str):
+        if self.mode == "replay":
+            entry = self._lookup(prompt)
+            if self.speed:
+                time.sleep(entry["total_seconds"] * self.speed)
+            return FakeMessage(entry["response"])
+
+        started = time.perf_counter()
+        response = self.llm.invoke(prompt)
+        elapsed = time.perf_counter() - started
+        self._record(prompt, [_content(response)], elapsed, elapsed)
+        return response
+
+    async def ainvoke(self, prompt: str):
+        if self.mode == "replay":
+            entry = self._lookup(prompt)
+            if self.speed:
+                await asyncio.sleep(entry["total_seconds"] * self.speed)
+            return FakeMessage(entry["response"])
+
+        started = time.perf_counter()
+        response = await self.llm.ainvoke(prompt)
+        elapsed = time.perf_counter() - started
+        self._record(prompt, [_content(response)], elapsed, elapsed)
+        return response
+
+    async def astream(self, prompt: str) -> AsyncIterator[Any]:
+        if self.mode == "replay":
+            entry = self._lookup(prompt)
+            chunks = entry.get("chunks") or [entry["response"]]
+            # Spread the time after the first chunk evenly over the rest
+            gap = (entry["total_seconds"] - entry["first_chunk_seconds"]) / max(1, len(chunks) - 1)
+            for i, chunk in enumerate(chunks):
+                if self.speed:
+                    await asyncio.sleep((entry["first_chunk_seconds"] if i == 0 else gap) * self.speed)
+                yield FakeMessage(chunk)
+            return
+
+        started = time.perf_counter()
+        first_chunk_seconds: Optional[float] = None
+        chunks: List[str] = []
+        async for chunk in self.llm.astream(prompt):
+            if first_chunk_seconds is None:
+                first_chunk_seconds = time.perf_counter() - started
+            chunks.append(_content(chunk))
+            yield chunk
+        total = time.perf_counter() - started
+        self._record(prompt, chunks, first_chunk_seconds if first_chunk_seconds is not None else total, total)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "recordings": len(self._recordings),
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+        }
@@ -0,0 +1,183 @@
+# backend/app/services/retrieval_cache.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used mapping with hit counters."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RetrievalCache:
+    """Caches query vectors and search results per collection.
+
+    Result keys include the collection's version counter, which ``bump`` moves
+    forward whenever documents are written, so stale results are never served.
+    With ``shared_path`` the versions and results also live in a local SQLite
+    file, letting every worker on the host share them and see each other's
+    invalidations.
+    """
+
+    def __init__(self, max_entries: int = 1024, shared_path: Optional[str] = None):
+        self.vectors = LRUCache(max_entries)
+        self.results = LRUCache(max_entries)
+        self.max_entries = max_entries
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._db = None
+        if shared_path:
+            directory = os.path.dirname(os.path.abspath(shared_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(shared_path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS versions (collection TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"RetrievalCache sharing results through {shared_path}")
+
+    def version(self, collection: str) -> int:
+        with self._lock:
+            if self._db is None:
+                return self._versions.get(collection, 0)
+            row = self._db.execute(
+                "SELECT version FROM versions WHERE collection = ?", (collection,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def bump(self, collection: str) -> None:
+        """Invalidate every cached result for a collection."""
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO versions (collection, version) VALUES (?, 1) "
+                    "ON CONFLICT(collection) DO UPDATE SET version = version + 1",
+                    (collection,)
+                )
+                self._db.commit()
+
+    def get_vector(self, collection: str, query: str) -> Optional[List[float]]:
+        return self.vectors.get((collection, query))
+
+    def put_vector(self, collection: str, query: str, vector: List[float]) -> None:
+        self.vectors.put((collection, query), vector)
+
+    def _result_key(
+        self, collection: str, query: str, k: int, filters: Optional[Dict[str, Any]], version: Optional[int]
+    ) -> str:
+        if version is None:
+            version = self.version(collection)
+        return json.dumps(
+            [collection, version, query, k, filters],
+            sort_keys=True, default=str
+        )
+
+    def get_results(
+        self,
+        collection: str,
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        version: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Cached results for the query, or None.
+
+        Pass the ``version`` read before a vector query to look up and later
+        store that query's results under the same key.
+        """
+        key = self._result_key(collection, query, k, filters, version)
+        results = self.results.get(key)
+        if results is None and self._db is not None:
+            with self._lock:
+                row = self._db.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row:
+                results = json.loads(row[0])
+                self.results.put(key, results)
+                # Counted as a miss locally but served without a vector query
+                self.results.hits += 1
+                self.results.misses -= 1
+        return [dict(result) for result in results] if results is not None else None
+
+    def put_results(
+        self,
+        collection: str,
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+        version: Optional[int] = None,
+    ) -> None:
+        """Store results computed against collection ``version`` (default: the
+        current one). Results from before a ``bump`` stay under the old
+        version and are never served after it."""
+        key = self._result_key(collection, query, k, filters, version)
+        self.results.put(key, [dict(result) for result in results])
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(results, default=str), time.time())
+                )
+                # Keep the shared table bounded to the newest entries
+                self._db.execute(
+                    "DELETE FROM results WHERE key NOT IN "
+                    "(SELECT key FROM results ORDER BY created DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "query_vectors": self.vectors.stats(),
+            "results": self.results.stats(),
+            "shared": self._db is not None,
+        }
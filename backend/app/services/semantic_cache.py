@@ -0,0 +1,129 @@
+# backend/app/services/semantic_cache.py
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_topic(topic: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", topic.lower()).split())
+
+
+class SemanticCache:
+    """Reuses generated results for topics that mean the same thing.
+
+    Entries are scoped to (endpoint, document id, request parameters); within
+    a scope the cached result whose topic embedding has the highest cosine
+    similarity to the new topic is returned if it reaches ``threshold``.
+    ``embed`` must return unit-length vectors. The least recently used
+    entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], List[float]],
+        threshold: float = 0.9,
+        max_entries: int = 512,
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scope(endpoint: str, document_id: str, params: Dict[str, Any]) -> str:
+        return json.dumps([endpoint, document_id, params], sort_keys=True, default=str)
+
+    def _vector(self, topic: str) -> np.ndarray:
+        return np.asarray(self.embed(normalize_topic(topic)), dtype=np.float32)
+
+    def lookup(
+        self, endpoint: str, document_id: str, topic: str, params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Return {"result", "topic", "similarity"} for the closest match, or None."""
+        scope = self._scope(endpoint, document_id, params)
+        vector = self._vector(topic)
+        with self._lock:
+            candidates = [
+                (entry_id, entry) for entry_id, entry in self._entries.items()
+                if entry["scope"] == scope
+            ]
+            best_id, best, best_similarity = None, None, -1.0
+            for entry_id, entry in candidates:
+                similarity = float(np.dot(vector, entry["vector"]))
+                if similarity > best_similarity:
+                    best_id, best, best_similarity = entry_id, entry, similarity
+
+            if best is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return {
+                "result": dict(best["result"]),
+                "topic": best["topic"],
+                "similarity": round(best_similarity, 4),
+            }
+
+    def store(
+        self,
+        endpoint: str,
+        document_id: str,
+        topic: str,
+        params: Dict[str, Any],
+        result: Dict[str, Any],
+    ) -> None:
+        vector = self._vector(topic)
+        with self._lock:
+            self._entries[self._next_id] = {
+                "scope": self._scope(endpoint, document_id, params),
+                "document_id": document_id,
+                "topic": topic,
+                "vector": vector,
+                "result": dict(result),
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_documents(self, document_ids: Iterable[str]) -> int:
+        """Drop every entry for the given documents; returns how many went."""
+        document_ids = set(document_ids)
+        if not document_ids:
+            return 0
+        with self._lock:
+            stale = [
+                entry_id for entry_id, entry in self._entries.items()
+                if entry["document_id"] in document_ids
+            ]
+            for entry_id in stale:
+                del self._entries[entry_id]
+            self.invalidated += len(stale)
+        if stale:
+            logger.info(f"SemanticCache dropped {len(stale)} entries for re-ingested documents")
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,60 @@
+# backend/app/services/single_flight.py
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.services.semantic_cache import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Key identical requests the same way: topics are normalized, key order ignored."""
+    params = dict(params)
+    if isinstance(params.get("topic"), str):
+        params["topic"] = normalize_topic(params["topic"])
+    return json.dumps([endpoint, params], sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """Coalesces identical in-flight async calls into one computation.
+
+    The first caller for a key starts the work as its own task; callers
+    arriving while it runs await the same task and get the same result (or
+    exception). A caller that goes away does not cancel the work for the rest.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task: Optional[asyncio.Task] = self._inflight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            logger.info(f"Coalesced request onto in-flight computation ({self.coalesced} so far)")
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+        }
+
+
+# Shared by the generation endpoints; one event loop per process
+generation_flights = SingleFlight()
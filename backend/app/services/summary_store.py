@@ -0,0 +1,90 @@
+# backend/app/services/summary_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryStore:
+    """SQLite home for precomputed document summaries, one row per document id.
+
+    Besides the document-level summary, the section summaries it was built
+    from are kept so a summary can be restyled without touching the chunks.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "document_id TEXT PRIMARY KEY, style TEXT NOT NULL, length TEXT NOT NULL, "
+            "summary TEXT NOT NULL, sections TEXT NOT NULL, chunks INTEGER NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        self._db.commit()
+        logger.info(f"Initialized SummaryStore at {path}")
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT style, length, summary, sections, chunks, created "
+                "FROM summaries WHERE document_id = ?",
+                (document_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "document_id": document_id,
+            "style": row[0],
+            "length": row[1],
+            "summary": row[2],
+            "sections": json.loads(row[3]),
+            "chunks": row[4],
+            "created": row[5],
+        }
+
+    def put(
+        self,
+        document_id: str,
+        style: str,
+        length: str,
+        summary: str,
+        sections: List[str],
+        chunks: int,
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(document_id, style, length, summary, sections, chunks, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (document_id, style, length, summary, json.dumps(sections), chunks, time.time())
+            )
+            self._db.commit()
+
+    def delete(self, document_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM summaries WHERE document_id = ?", (document_id,))
+            self._db.commit()
+
+
+_summary_store = None
+_summary_store_lock = threading.Lock()
+
+
+def get_summary_store() -> SummaryStore:
+    """Get the process-wide summary store"""
+    global _summary_store
+    with _summary_store_lock:
+        if _summary_store is None:
+            _summary_store = SummaryStore(settings.SUMMARY_STORE_PATH)
+        return _summary_store
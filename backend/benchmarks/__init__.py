@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+"""Microbenchmarks for the ingest and retrieval hot paths; see run.py."""
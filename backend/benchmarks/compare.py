@@ -0,0 +1,59 @@
+# backend/benchmarks/compare.py
+"""Compare two benchmark result files and fail on regressions.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/new.json --threshold 10
+
+Prints the change of every metric present in both runs and exits 1 if any
+got worse by more than ``--threshold`` percent (in its "better" direction).
+"""
+import argparse
+import json
+import sys
+
+from .results import load, record_key
+
+
+def compare(base, new, threshold: float):
+    """Return (rows, regressions); each row is (key, metric, base, new, change %)."""
+    base_records = {record_key(entry): entry for entry in base["results"]}
+    rows, regressions = [], []
+    for entry in new["results"]:
+        previous = base_records.get(record_key(entry))
+        if previous is None:
+            continue
+        label = f"{entry['suite']}/{entry['case']} {json.dumps(entry['params'], sort_keys=True)}"
+        for name, current in entry["metrics"].items():
+            old = previous["metrics"].get(name)
+            if old is None or not old["value"]:
+                continue
+            change = (current["value"] - old["value"]) / abs(old["value"]) * 100
+            row = (label, name, old["value"], current["value"], change)
+            rows.append(row)
+            worse = -change if current["better"] == "higher" else change
+            if worse > threshold:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    rows, regressions = compare(base, new, args.threshold)
+    print(f"base {base['meta'].get('git_commit') or '?'} -> new {new['meta'].get('git_commit') or '?'}")
+    for label, name, old, current, change in rows:
+        flag = "  REGRESSION" if (label, name, old, current, change) in regressions else ""
+        print(f"{label} {name}: {old} -> {current} ({change:+.1f}%){flag}")
+
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
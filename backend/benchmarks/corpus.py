@@ -0,0 +1,119 @@
+# backend/benchmarks/corpus.py
+"""Fixed synthetic corpora: the same seed always gives the same text and PDF bytes."""
+import os
+import random
+from typing import List
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".corpora")
+
+# Document sizes, in pages, the parse and write benchmarks run against
+PAGE_COUNTS = (10, 100, 500, 2000)
+LINES_PER_PAGE = 45
+LINE_CHARS = 90
+
+SUBJECTS = [
+    "Binary search trees", "Database normalization", "Recursion", "Photosynthesis",
+    "Supply and demand", "The French Revolution", "Newton's second law", "Hash tables",
+    "Cell division", "Operating system scheduling", "Linear regression", "Plate tectonics",
+    "Gradient descent", "Protein folding", "Keynesian economics", "Graph traversal",
+]
+VERBS = [
+    "are introduced", "can be explained", "depend on", "are compared with", "reduce",
+    "are derived from", "are examined through", "build on", "contrast with", "motivate",
+]
+OBJECTS = [
+    "worked examples in chapter {n}", "smaller subproblems of the same kind",
+    "the assumptions listed on page {n}", "short definition questions", "longer case studies",
+    "redundancy and inconsistency", "the lecture notes of week {n}", "experimental evidence",
+    "a proof by induction", "the trade-offs students should be able to compare",
+]
+
+
+def sentence(rng: random.Random) -> str:
+    obj = rng.choice(OBJECTS).format(n=rng.randint(1, 40))
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {obj}."
+
+
+def page_lines(page_number: int, seed: int = 0) -> List[str]:
+    """About LINES_PER_PAGE lines of at most LINE_CHARS characters."""
+    rng = random.Random(seed * 1_000_003 + page_number)
+    lines, current = [], ""
+    while len(lines) < LINES_PER_PAGE:
+        part = sentence(rng)
+        if current and len(current) + 1 + len(part) > LINE_CHARS:
+            lines.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    return lines
+
+
+def pages(count: int, seed: int = 0) -> List[str]:
+    return ["\n".join(page_lines(i, seed)) for i in range(count)]
+
+
+def texts(count: int, chars: int = 1000, seed: int = 0) -> List[str]:
+    """``count`` distinct chunk-sized passages (for embedding and write benchmarks)."""
+    rng = random.Random(seed)
+    result = []
+    for i in range(count):
+        passage = f"Passage {i}."
+        while len(passage) < chars:
+            passage += " " + sentence(rng)
+        result.append(passage[:chars])
+    return result
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, page_texts: List[str]) -> None:
+    """Write a minimal text-only PDF (Helvetica, one Tj per line) PyPDF2 can extract."""
+    objects = []  # object bodies, numbered from 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for text in page_texts:
+        operations = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td"]
+        operations += [f"({_pdf_string(line)}) Tj T*" for line in text.split("\n")]
+        operations.append("ET")
+        stream = "\n".join(operations).encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (page_tree, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(output)
+
+
+def corpus_pdf(page_count: int, seed: int = 0) -> str:
+    """Path of the ``page_count``-page PDF for ``seed``, generated on first use."""
+    path = os.path.join(CORPUS_DIR, f"corpus-{page_count}p-seed{seed}.pdf")
+    if not os.path.exists(path):
+        write_pdf(path, pages(page_count, seed))
+    return path
@@ -0,0 +1,93 @@
+# backend/benchmarks/results.py
+"""Result records and the JSON file format shared by run.py and compare.py.
+
+A results file is ``{"meta": {...}, "results": [record, ...]}`` where each
+record is::
+
+    {"suite": "search", "case": "latency", "params": {"chunks": 5000},
+     "metrics": {"p99_ms": {"value": 12.3, "unit": "ms", "better": "lower"}}}
+
+Records are matched across runs by (suite, case, params).
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any, Dict, List, Sequence
+
+SCHEMA_VERSION = 1
+
+
+def metric(value: float, unit: str, better: str = "higher") -> Dict[str, Any]:
+    return {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def record(suite: str, case: str, params: Dict[str, Any], **metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {"suite": suite, "case": case, "params": params, "metrics": metrics}
+
+
+def record_key(entry: Dict[str, Any]) -> str:
+    return json.dumps([entry["suite"], entry["case"], entry["params"]], sort_keys=True)
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, ``q`` in [0, 100]."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latency_metrics(samples_seconds: Sequence[float]) -> Dict[str, Dict[str, Any]]:
+    samples = [s * 1000 for s in samples_seconds]
+    return {
+        "p50_ms": metric(percentile(samples, 50), "ms", "lower"),
+        "p95_ms": metric(percentile(samples, 95), "ms", "lower"),
+        "p99_ms": metric(percentile(samples, 99), "ms", "lower"),
+        "mean_ms": metric(statistics.fmean(samples), "ms", "lower"),
+    }
+
+
+def best_of(repeats: int, fn) -> float:
+    """Fastest wall time of ``repeats`` calls to ``fn``, in seconds."""
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_meta(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": args,
+    }
+
+
+def save(path: str, meta: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
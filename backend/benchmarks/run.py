@@ -0,0 +1,94 @@
+# backend/benchmarks/run.py
+"""Run the ingest and retrieval microbenchmarks and write the results as JSON.
+
+From backend/:
+
+    python -m benchmarks.run                          # every suite, full sizes
+    python -m benchmarks.run --quick                  # small sizes, for a smoke run
+    python -m benchmarks.run --suites parse,qa_parse --output benchmarks/results/parse.json
+
+Corpora are synthetic and fixed (see benchmarks/corpus.py), caches are off and
+the chat model is the local fake, so runs on the same machine are comparable.
+Compare two runs with ``python -m benchmarks.compare BASE NEW``.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from app.config import settings
+
+from . import suites
+from .corpus import PAGE_COUNTS
+from .results import run_meta, save
+
+SUITES = ("parse", "embed", "write", "search", "qa_parse")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _ints(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suites", default=",".join(SUITES), help="comma-separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--quick", action="store_true", help="small sizes and one repeat")
+    parser.add_argument("--pages", type=_ints, default=list(PAGE_COUNTS), help="corpus sizes for parse")
+    parser.add_argument("--write-pages", type=_ints, default=[10, 100, 500], help="corpus sizes for write")
+    parser.add_argument("--batch-sizes", type=_ints, default=[1, 8, 32, 128], help="create_embeddings call sizes")
+    parser.add_argument("--embed-texts", type=int, default=512)
+    parser.add_argument("--collection-sizes", type=_ints, default=[1000, 5000, 20000], help="chunks for search")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--qa-pairs", type=_ints, default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--pdf-workers", type=int, default=settings.PDF_EXTRACT_WORKERS)
+    parser.add_argument("--write-batch-size", type=int, default=settings.INGEST_BATCH_SIZE)
+    parser.add_argument("--embedding-backend", default=settings.EMBEDDING_BACKEND)
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.pages, args.write_pages, args.batch_sizes = [10, 100], [10], [1, 32]
+        args.embed_texts, args.collection_sizes, args.queries = 128, [500, 2000], 50
+        args.qa_pairs, args.repeats = [10, 100], 1
+
+    selected = [name.strip() for name in args.suites.split(",") if name.strip()]
+    unknown = set(selected) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.WARNING)
+    suites.configure_settings()
+
+    runners = {
+        "parse": lambda: suites.bench_parse(args.pages, args.repeats, args.pdf_workers),
+        "embed": lambda: suites.bench_embed(args.batch_sizes, args.embed_texts, args.repeats, args.embedding_backend),
+        "write": lambda: suites.bench_write(
+            args.write_pages, args.repeats, args.write_batch_size, args.embedding_backend
+        ),
+        "search": lambda: suites.bench_search(args.collection_sizes, args.queries, args.k, args.embedding_backend),
+        "qa_parse": lambda: suites.bench_qa_parse(args.qa_pairs, args.repeats),
+    }
+
+    results = []
+    for name in selected:
+        started = time.perf_counter()
+        suite_results = runners[name]()
+        results.extend(suite_results)
+        print(f"{name}: {len(suite_results)} results in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        for entry in suite_results:
+            values = ", ".join(f"{key}={m['value']} {m['unit']}" for key, m in entry["metrics"].items())
+            print(f"  {entry['case']} {json.dumps(entry['params'])}: {values}", file=sys.stderr)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    save(output, run_meta(vars(args)), results)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# backend/benchmarks/suites.py
+"""The benchmarks themselves. Each suite returns a list of result records.
+
+Heavy modules (PyPDF2, sentence-transformers, Chroma) are imported inside
+the suite that needs them, so a run of only the cheap suites stays cheap.
+"""
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Sequence
+
+from app.config import settings
+
+from . import corpus
+from .results import best_of, latency_metrics, metric, record
+
+
+def configure_settings() -> None:
+    """Measure the raw hot paths: no caches, no Gemini, no ingest-time summaries."""
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.RETRIEVAL_CACHE_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+    settings.SEMANTIC_CACHE_ENABLED = False
+    settings.PRECOMPUTE_SUMMARIES = False
+    settings.LLM_PROVIDER = "fake"
+    settings.LLM_RECORD_REPLAY_MODE = None
+
+
+def _rag_service(persist_directory: str, embedding_backend: str):
+    from app.services.rag import RAGFactory
+
+    return RAGFactory.create_rag_service(
+        provider="fake",
+        api_key="benchmark",
+        collection_name=f"bench_{uuid.uuid4().hex[:12]}",
+        persist_directory=persist_directory,
+        embedding_backend=embedding_backend,
+    )
+
+
+def _chunks(texts: Sequence[str], document_id: str):
+    from app.models.document import DocumentChunk
+
+    return [
+        DocumentChunk(text=text, document_id=document_id, metadata={"chunk_index": i})
+        for i, text in enumerate(texts)
+    ]
+
+
+# ------------------ parse ------------------
+
+def bench_parse(page_counts: Sequence[int], repeats: int, pdf_workers: int) -> List[Dict[str, Any]]:
+    """PDF page extraction (``_iter_pdf_pages``) and the whole ``iter_chunks`` pipeline."""
+    from app.services.document_processor import DocumentProcessor
+
+    results = []
+    for pages in page_counts:
+        path = corpus.corpus_pdf(pages)
+        megabytes = os.path.getsize(path) / 1e6
+        for workers in sorted({1, pdf_workers}):
+            processor = DocumentProcessor(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP, pdf_workers=workers)
+            seconds = best_of(repeats, lambda: sum(1 for _ in processor._iter_pdf_pages(path)))
+            results.append(record(
+                "parse", "pdf_pages", {"pages": pages, "pdf_workers": workers},
+                seconds=metric(seconds, "s", "lower"),
+                pages_per_sec=metric(pages / seconds, "pages/s"),
+                mb_per_sec=metric(megabytes / seconds, "MB/s"),
+            ))
+
+        # End to end, as ingestion runs it: page extraction feeding the chunker
+        processor = DocumentProcessor(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP, pdf_workers=pdf_workers)
+        chunk_count = sum(1 for _ in processor.iter_chunks(path, "benchmark"))
+        seconds = best_of(repeats, lambda: sum(1 for _ in processor.iter_chunks(path, "benchmark")))
+        results.append(record(
+            "parse", "iter_chunks",
+            {
+                "pages": pages, "pdf_workers": pdf_workers,
+                "chunk_size": settings.CHUNK_SIZE, "chunk_overlap": settings.CHUNK_OVERLAP,
+            },
+            seconds=metric(seconds, "s", "lower"),
+            pages_per_sec=metric(pages / seconds, "pages/s"),
+            chunks_per_sec=metric(chunk_count / seconds, "chunks/s"),
+        ))
+    return results
+
+
+# ------------------ embed ------------------
+
+def bench_embed(
+    batch_sizes: Sequence[int], text_count: int, repeats: int, embedding_backend: str
+) -> List[Dict[str, Any]]:
+    """``EmbeddingService.create_embeddings`` texts/sec when called ``batch_size`` texts at a time."""
+    from app.services.embedding_service import EmbeddingService
+
+    service = EmbeddingService(backend=embedding_backend)
+    service.cache = None
+    texts = corpus.texts(text_count, settings.CHUNK_SIZE)
+    service.create_embeddings(texts[:8])  # load and warm up the model
+
+    results = []
+    for batch_size in batch_sizes:
+        def run():
+            for start in range(0, len(texts), batch_size):
+                service.create_embeddings(texts[start:start + batch_size])
+
+        seconds = best_of(repeats, run)
+        results.append(record(
+            "embed", "create_embeddings",
+            {"batch_size": batch_size, "texts": len(texts), "backend": service.backend},
+            seconds=metric(seconds, "s", "lower"),
+            texts_per_sec=metric(len(texts) / seconds, "texts/s"),
+        ))
+    return results
+
+
+# ------------------ write ------------------
+
+def bench_write(
+    page_counts: Sequence[int], repeats: int, batch_size: int, embedding_backend: str
+) -> List[Dict[str, Any]]:
+    """``LangChainRAG.add_documents`` (embed + Chroma write) into a fresh collection."""
+    from app.services.document_processor import DocumentProcessor
+
+    processor = DocumentProcessor(settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-write-") as persist_directory:
+        rag_service = None
+        for pages in page_counts:
+            chunks = list(processor.iter_chunks(corpus.corpus_pdf(pages), f"bench-{pages}"))
+            best = float("inf")
+            for _ in range(max(1, repeats)):
+                # A fresh collection each time, so every repeat writes the same amount
+                rag_service = _rag_service(persist_directory, embedding_backend)
+                if best == float("inf"):
+                    rag_service.warmup()
+                started = time.perf_counter()
+                if not rag_service.add_documents(chunks, batch_size=batch_size):
+                    raise RuntimeError(f"add_documents failed for the {pages}-page corpus")
+                best = min(best, time.perf_counter() - started)
+            results.append(record(
+                "write", "add_documents", {"pages": pages, "chunks": len(chunks), "batch_size": batch_size},
+                seconds=metric(best, "s", "lower"),
+                chunks_per_sec=metric(len(chunks) / best, "chunks/s"),
+            ))
+    return results
+
+
+# ------------------ search ------------------
+
+def bench_search(
+    collection_sizes: Sequence[int], query_count: int, k: int, embedding_backend: str
+) -> List[Dict[str, Any]]:
+    """``LangChainRAG.search`` latency percentiles as one collection grows."""
+    rng = random.Random(7)
+    queries = [corpus.sentence(rng) for _ in range(query_count)]
+    texts = corpus.texts(max(collection_sizes), settings.CHUNK_SIZE, seed=1)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-search-") as persist_directory:
+        rag_service = _rag_service(persist_directory, embedding_backend)
+        rag_service.warmup()
+        stored = 0
+        for size in sorted(collection_sizes):
+            if not rag_service.add_documents(_chunks(texts[stored:size], f"bench-{size}")):
+                raise RuntimeError(f"add_documents failed growing the collection to {size}")
+            stored = size
+            for query in queries[:5]:
+                rag_service.search(query, k=k)
+
+            samples = []
+            for query in queries:
+                started = time.perf_counter()
+                rag_service.search(query, k=k)
+                samples.append(time.perf_counter() - started)
+            results.append(record(
+                "search", "latency", {"chunks": size, "k": k, "queries": len(queries)},
+                qps=metric(len(samples) / sum(samples), "queries/s"),
+                **latency_metrics(samples),
+            ))
+    return results
+
+
+# ------------------ Q&A parsing ------------------
+
+def qa_output(pairs: int, style: str, topic: str = "gradient descent") -> str:
+    """A model answer with ``pairs`` Q&A pairs, in one of the formats the parser accepts."""
+    rng = random.Random(pairs)
+    items = [
+        {
+            "question": f"Question {i}: how does {topic} relate to {corpus.sentence(rng)}",
+            "answer": " ".join(corpus.sentence(rng) for _ in range(3)),
+            "type": "conceptual",
+            "difficulty": ("easy", "medium", "hard")[i % 3],
+            "topic": topic,
+        }
+        for i in range(pairs)
+    ]
+    if style == "json":
+        return json.dumps({"qa_pairs": items}, indent=2)
+    if style == "fenced":
+        return "Here are the questions.\n\n```json\n" + json.dumps({"qa_pairs": items}, indent=2) + "\n```"
+    # "lines": no JSON at all, so the regex fallbacks do the work
+    return "\n\n".join(f"Q: {item['question']}\nA: {item['answer']}" for item in items)
+
+
+def bench_qa_parse(pair_counts: Sequence[int], repeats: int) -> List[Dict[str, Any]]:
+    """``QAGenerator._extract_qa_from_response`` on large model outputs."""
+    from app.services.academic.qa_generator import QAGenerator
+
+    generator = QAGenerator(rag_service=None)
+    results = []
+    for pairs in pair_counts:
+        for style in ("json", "fenced", "lines"):
+            output = qa_output(pairs, style)
+            parsed = len(generator._extract_qa_from_response(output, "gradient descent", pairs))
+            seconds = best_of(
+                repeats, lambda: generator._extract_qa_from_response(output, "gradient descent", pairs)
+            )
+            results.append(record(
+                "qa_parse", style, {"pairs": pairs},
+                ms=metric(seconds * 1000, "ms", "lower"),
+                mb_per_sec=metric(len(output) / seconds / 1e6, "MB/s"),
+                pairs_parsed=metric(parsed, "pairs"),
+            ))
+    return results
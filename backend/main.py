@@ -1,18 +1,35 @@
-﻿from fastapi import FastAPI
+﻿from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import documents
+from fastapi.responses import JSONResponse
+from app.api.endpoints import documents, metrics
 from app.config import settings
+from rag_singleton import (
+    get_rag_service as get_shared_rag_service,
+    get_warmup_error,
+    is_rag_service_ready,
+    warmup_rag_service,
+)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /ready can answer 503 until it finishes
+    warmup_task = asyncio.create_task(asyncio.to_thread(warmup_rag_service))
+    yield
+    warmup_task.cancel()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Teaching Assistant",
     description="Generative AI Agent for Automated Teaching Content Creation using RAG",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -26,21 +43,14 @@ app.add_middleware(
 
 # Include routers
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
+app.include_router(metrics.router, tags=["metrics"])
 
-# Global RAG service instance
-_rag_service = None
+# Label stage metrics with the route being served
+app.middleware("http")(metrics.track_requests)
 
 def get_rag_service():
     """Get LangChain RAG service instance"""
-    global _rag_service
-    if _rag_service is None:
-        from app.services.rag import RAGFactory
-        _rag_service = RAGFactory.create_rag_service(
-            provider="langchain",
-            api_key=settings.GEMINI_API_KEY
-        )
-        logger.info("Created LangChain RAG service")
-    return _rag_service
+    return get_shared_rag_service()
 
 @app.get("/")
 async def root():
@@ -50,6 +60,17 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "AI Teaching Assistant"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Report 503 until the RAG service is built and warmed up"""
+    if not is_rag_service_ready():
+        error = get_warmup_error()
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed" if error else "warming_up", "error": error}
+        )
+    return {"status": "ready"}
+
 @app.get("/api/rag-status")
 async def rag_status():
     """Get status of LangChain RAG service"""
@@ -61,9 +82,14 @@ async def rag_status():
         else:
             stats = {"status": "available", "type": "langchain"}
         
+        from app.services.model_registry import model_registry
+        from app.services.single_flight import generation_flights
+
         return {
             "rag_service": stats,
             "provider": "langchain",
+            "embedding_models": model_registry.memory_report(),
+            "request_coalescing": generation_flights.stats(),
             "status": "active"
         }
         
@@ -1,5 +1,7 @@
 # backend/rag_singleton.py
 import logging
+import threading
+import time
 from app.services.rag import RAGFactory
 from app.config import settings
 
@@ -7,14 +9,40 @@ logger = logging.getLogger(__name__)
 
 # Singleton instance for LangChain RAG service
 _rag_service = None
+_rag_service_lock = threading.Lock()
+
+# Set once warmup_rag_service has built the service and exercised it
+_ready = threading.Event()
+_warmup_error = None
 
 def get_rag_service():
     """Get LangChain RAG service instance"""
     global _rag_service
     if _rag_service is None:
-        _rag_service = RAGFactory.create_rag_service(
-            provider="langchain",
-            api_key=settings.GEMINI_API_KEY
-        )
-        logger.info("Created LangChain RAG service singleton")
-    return _rag_service
\ No newline at end of file
+        # Concurrent first callers must not build the service twice
+        with _rag_service_lock:
+            if _rag_service is None:
+                _rag_service = RAGFactory.create_rag_service(
+                    provider="langchain",
+                    api_key=settings.GEMINI_API_KEY
+                )
+                logger.info("Created LangChain RAG service singleton")
+    return _rag_service
+
+def warmup_rag_service():
+    """Build the service and run one embedding and vector query through it"""
+    global _warmup_error
+    try:
+        started = time.perf_counter()
+        get_rag_service().warmup()
+        _ready.set()
+        logger.info(f"RAG service warmed up in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        _warmup_error = str(e)
+        logger.error(f"RAG service warmup failed: {str(e)}", exc_info=True)
+
+def is_rag_service_ready() -> bool:
+    return _ready.is_set()
+
+def get_warmup_error():
+    return _warmup_error
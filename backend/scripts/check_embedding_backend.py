@@ -0,0 +1,94 @@
+# backend/scripts/check_embedding_backend.py
+"""Compare an embedding backend against the float sentence-transformers model.
+
+Reports encode throughput for both and the cosine drift of the candidate's
+vectors from the float ones, on a fixed synthetic corpus:
+
+    python scripts/check_embedding_backend.py --backend torch-int8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_backends import EMBEDDING_BACKENDS, load_embedding_model  # noqa: E402
+
+SUBJECTS = [
+    "Binary search trees", "Database normalization", "Recursion", "Photosynthesis",
+    "Supply and demand", "The French Revolution", "Newton's second law", "Hash tables",
+    "Cell division", "Operating system scheduling", "Linear regression", "Plate tectonics",
+]
+PREDICATES = [
+    "are introduced in chapter {n} together with worked examples and exercises.",
+    "can be explained by breaking the problem into smaller subproblems of the same kind.",
+    "reduce redundancy and improve consistency when applied step by step.",
+    "depend on several assumptions that the lecture notes list on page {n}.",
+    "are commonly examined with short definition questions and longer case studies.",
+    "have advantages and disadvantages that students should be able to compare.",
+]
+
+
+def build_corpus(size: int):
+    corpus = []
+    for i in range(size):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        predicate = PREDICATES[(i // len(SUBJECTS)) % len(PREDICATES)].format(n=i % 40 + 1)
+        corpus.append(f"{subject} {predicate}")
+    return corpus
+
+
+def measure(model, corpus, batch_size: int, repeats: int):
+    model.encode(corpus[:batch_size], batch_size=batch_size, show_progress_bar=False)  # warm up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        vectors = model.encode(
+            corpus, batch_size=batch_size, normalize_embeddings=True, show_progress_bar=False
+        )
+        best = min(best, time.perf_counter() - start)
+    return np.asarray(vectors, dtype=np.float32), len(corpus) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backend", default="torch-int8", choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--onnx-file", default=None)
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-drift", type=float, default=0.02,
+                        help="fail if mean cosine drift exceeds this")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.texts)
+    reference, reference_rate = measure(
+        load_embedding_model(args.model, "torch"), corpus, args.batch_size, args.repeats
+    )
+    candidate, candidate_rate = measure(
+        load_embedding_model(args.model, args.backend, args.onnx_file), corpus, args.batch_size, args.repeats
+    )
+
+    # Both sides are normalized, so the row-wise dot product is the cosine
+    drift = 1.0 - np.sum(reference * candidate, axis=1)
+    report = {
+        "model": args.model,
+        "backend": args.backend,
+        "texts": len(corpus),
+        "float_texts_per_sec": round(reference_rate, 1),
+        "backend_texts_per_sec": round(candidate_rate, 1),
+        "speedup": round(candidate_rate / reference_rate, 2),
+        "mean_cosine_drift": round(float(drift.mean()), 6),
+        "max_cosine_drift": round(float(drift.max()), 6),
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["mean_cosine_drift"] <= args.max_drift else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
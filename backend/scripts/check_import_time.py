@@ -0,0 +1,89 @@
+# backend/scripts/check_import_time.py
+"""Fail if importing the API app gets slow or starts loading heavy ML modules.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+reads the cumulative import time of ``app.main`` and checks that none of the
+provider libraries were imported along the way:
+
+    python scripts/check_import_time.py --budget-ms 1500
+
+tests/test_import_time.py runs it with ``IMPORT_TIME_BUDGET_MS`` (default
+1500) as part of the test suite.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only RAGFactory.create_rag_service should bring these in
+HEAVY_MODULES = (
+    "torch",
+    "sentence_transformers",
+    "chromadb",
+    "langchain_chroma",
+    "langchain_google_genai",
+    "langchain_huggingface",
+    "google.generativeai",
+)
+
+
+def measure_import(module: str):
+    """Return (cumulative microseconds, list of imported module names)."""
+    env = dict(os.environ)
+    # Settings needs a key to load; the value is never used at import time
+    env.setdefault("GEMINI_API_KEY", "import-time-check")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    cumulative_us = None
+    imported = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        name = parts[2].strip()
+        imported.append(name)
+        if name == module:
+            cumulative_us = int(parts[1])
+    return cumulative_us, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    cumulative_us, imported = measure_import(args.module)
+    if cumulative_us is None:
+        print(f"Could not find {args.module} in -X importtime output")
+        return 2
+
+    heavy = sorted(
+        name for name in set(imported)
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    )
+    elapsed_ms = cumulative_us / 1000
+    print(f"import {args.module}: {elapsed_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print("Heavy modules imported eagerly: " + ", ".join(heavy))
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print("Import time is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
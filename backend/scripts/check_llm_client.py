@@ -0,0 +1,85 @@
+# backend/scripts/check_llm_client.py
+"""Exercise ResilientLLMClient against the local FakeChatModel.
+
+Runs three scenarios without touching the real API and fails if the client
+lets a raw provider error through or does not fail fast:
+
+    python scripts/check_llm_client.py
+
+- provider quota: the fake rejects calls beyond its per-minute quota;
+  retries back off and the overflow ends as LLMRateLimitError (429)
+- local budget: the client's own request bucket matches the quota, so
+  the overflow is rejected before it ever reaches the provider
+- outage: every call fails; the circuit breaker opens and later calls
+  fail with LLMUnavailableError (503) without reaching the provider
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.fake_llm import FakeChatModel  # noqa: E402
+from app.services.llm_client import (  # noqa: E402
+    CircuitBreaker, LLMRateLimitError, LLMUnavailableError, ResilientLLMClient
+)
+
+CALLS = 12
+
+
+async def run_calls(client: ResilientLLMClient, count: int = CALLS):
+    results = await asyncio.gather(
+        *(client.ainvoke(f"prompt {i}") for i in range(count)), return_exceptions=True
+    )
+    outcome = {"ok": 0, "rate_limited": 0, "unavailable": 0, "other": []}
+    for result in results:
+        if isinstance(result, LLMRateLimitError):
+            outcome["rate_limited"] += 1
+        elif isinstance(result, LLMUnavailableError):
+            outcome["unavailable"] += 1
+        elif isinstance(result, Exception):
+            outcome["other"].append(repr(result))
+        else:
+            outcome["ok"] += 1
+    return outcome
+
+
+def fast_client(llm, **kwargs) -> ResilientLLMClient:
+    defaults = dict(max_retries=2, backoff_base_seconds=0.01, backoff_max_seconds=0.05)
+    defaults.update(kwargs)
+    return ResilientLLMClient(llm, **defaults)
+
+
+async def main() -> int:
+    report = {}
+    failures = []
+
+    fake = FakeChatModel(quota_per_minute=5)
+    outcome = await run_calls(fast_client(fake, breaker=CircuitBreaker(failure_threshold=1000)))
+    report["provider_quota"] = {**outcome, "provider_calls": fake.calls}
+    if outcome["ok"] != 5 or outcome["rate_limited"] != CALLS - 5 or outcome["other"]:
+        failures.append("provider_quota")
+
+    fake = FakeChatModel(quota_per_minute=5)
+    outcome = await run_calls(fast_client(fake, requests_per_minute=5, max_queue_seconds=0.5))
+    report["local_budget"] = {**outcome, "provider_calls": fake.calls}
+    if outcome["ok"] != 5 or fake.rejected or outcome["other"]:
+        failures.append("local_budget")
+
+    fake = FakeChatModel(failure_rate=1.0)
+    client = fast_client(fake, max_concurrency=1, breaker=CircuitBreaker(failure_threshold=3, reset_seconds=60))
+    outcome = await run_calls(client)
+    report["outage"] = {**outcome, "provider_calls": fake.calls, "breaker": client.breaker.state}
+    if outcome["unavailable"] != CALLS or fake.calls > 3 or client.breaker.state != "open":
+        failures.append("outage")
+
+    print(json.dumps(report, indent=2))
+    if failures:
+        print("Unexpected behaviour in: " + ", ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,56 @@
+# backend/tests/conftest.py
+import os
+import uuid
+
+import pytest
+
+# Settings needs a key to load; tests never call Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+
+@pytest.fixture
+def rag_settings(monkeypatch):
+    """Settings for ``rag_service``: only the retrieval cache is on.
+
+    Tests change further settings on it before requesting ``rag_service``.
+    """
+    pytest.importorskip("langchain_chroma")
+    pytest.importorskip("sentence_transformers")
+    from app.config import settings
+
+    for name, value in {
+        "EMBEDDING_CACHE_ENABLED": False,
+        "QUERY_BATCHING_ENABLED": False,
+        "LLM_CACHE_ENABLED": False,
+        "SEMANTIC_CACHE_ENABLED": False,
+        "PRECOMPUTE_SUMMARIES": False,
+        "LLM_RECORD_REPLAY_MODE": None,
+        "RETRIEVAL_CACHE_ENABLED": True,
+        "RETRIEVAL_CACHE_SHARED_PATH": None,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    return settings
+
+
+@pytest.fixture
+def rag_service(rag_settings, tmp_path):
+    """LangChainRAG with the fake chat model and a throwaway Chroma directory"""
+    from app.services.rag import RAGFactory
+    return RAGFactory.create_rag_service(
+        provider="fake",
+        api_key="test",
+        collection_name=f"test_{uuid.uuid4().hex}",
+        persist_directory=str(tmp_path / "chroma"),
+    )
+
+
+@pytest.fixture
+def make_chunks():
+    """Build DocumentChunks for ``texts`` the way DocumentProcessor would"""
+    def build(document_id, texts):
+        from app.models.document import DocumentChunk
+        return [
+            DocumentChunk(text=text, document_id=document_id, metadata={"chunk_index": i, "page": 1})
+            for i, text in enumerate(texts)
+        ]
+    return build
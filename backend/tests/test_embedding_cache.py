@@ -0,0 +1,96 @@
+# backend/tests/test_embedding_cache.py
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.embedding_cache import EmbeddingCache  # noqa: E402
+
+
+def vector(seed: float, dimension: int = 8):
+    return [seed + i / 100 for i in range(dimension)]
+
+
+def assert_cached(cache: EmbeddingCache, text: str, expected):
+    (found,) = cache.get_many([text])
+    assert found is not None, text
+    np.testing.assert_allclose(found, expected, atol=1e-2)
+
+
+def put_in_order(cache: EmbeddingCache, texts):
+    # Distinct last-use times so the eviction order is known
+    for i, text in enumerate(texts):
+        cache.put_many([text], [vector(i)])
+        time.sleep(0.002)
+
+
+def test_roundtrip_and_reopen(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "test/model", max_entries=10)
+    cache.put_many(["alpha", "beta"], [vector(1), vector(2)])
+
+    found = cache.get_many(["alpha", "missing", "beta"])
+    assert found[1] is None
+    np.testing.assert_allclose(found[0], vector(1), atol=1e-2)
+    np.testing.assert_allclose(found[2], vector(2), atol=1e-2)
+    # Whitespace differences map to the same entry
+    assert_cached(cache, "  alpha\n", vector(1))
+
+    reopened = EmbeddingCache(str(tmp_path), "test/model", max_entries=10)
+    assert_cached(reopened, "beta", vector(2))
+    assert reopened.get_many(["alpha"])[0] is not None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=3)
+    put_in_order(cache, ["a", "b", "c"])
+    # A hit makes "a" recent again
+    cache.get_many(["a"])
+
+    cache.put_many(["d"], [vector(9)])
+
+    assert cache.get_many(["b"])[0] is None
+    assert_cached(cache, "a", vector(0))
+    assert_cached(cache, "c", vector(2))
+    assert_cached(cache, "d", vector(9))
+    assert cache.stats()["entries"] == 3
+
+
+def test_rewriting_a_key_never_gives_its_slot_to_a_new_key(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=3)
+    put_in_order(cache, ["a", "b", "c"])
+
+    # "a" is the oldest entry, but it is being rewritten in the same call
+    cache.put_many(["a", "d"], [vector(5), vector(6)])
+
+    assert_cached(cache, "a", vector(5))
+    assert_cached(cache, "d", vector(6))
+    assert_cached(cache, "c", vector(2))
+    assert cache.get_many(["b"])[0] is None
+    assert cache.stats()["entries"] == 3
+
+
+def test_more_new_keys_than_capacity_keeps_vectors_consistent(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=3)
+    put_in_order(cache, ["a", "b"])
+
+    texts = ["a", "x", "y", "z"]
+    cache.put_many(texts, [vector(10 + i) for i in range(len(texts))])
+
+    assert cache.stats()["entries"] == 3
+    assert_cached(cache, "a", vector(10))
+    # Whatever was kept must hold its own vector
+    for i, text in enumerate(texts[1:], start=1):
+        (found,) = cache.get_many([text])
+        if found is not None:
+            np.testing.assert_allclose(found, vector(10 + i), atol=1e-2)
+
+
+def test_capacity_change_starts_over(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=3)
+    cache.put_many(["a"], [vector(1)])
+
+    resized = EmbeddingCache(str(tmp_path), "model", max_entries=5)
+    assert resized.get_many(["a"])[0] is None
+    resized.put_many(["a"], [vector(2)])
+    assert_cached(resized, "a", vector(2))
@@ -0,0 +1,22 @@
+# backend/tests/test_import_time.py
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(BACKEND_DIR, "scripts", "check_import_time.py")
+
+
+def test_app_import_is_within_budget_and_skips_heavy_modules():
+    # The app has to be importable at all for the measurement to mean anything
+    pytest.importorskip("fastapi")
+    pytest.importorskip("pydantic_settings")
+
+    budget_ms = os.environ.get("IMPORT_TIME_BUDGET_MS", "1500")
+    completed = subprocess.run(
+        [sys.executable, SCRIPT, "--budget-ms", budget_ms],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
@@ -0,0 +1,90 @@
+# backend/tests/test_ingestion.py
+import threading
+import time
+
+import pytest
+
+PARAGRAPH = "Photosynthesis converts light energy into chemical energy stored in glucose. "
+
+
+def write_text(path, paragraphs, tail=b""):
+    path.write_bytes(
+        "\n\n".join(f"{i}. {PARAGRAPH * 6}" for i in range(paragraphs)).encode("utf-8") + tail
+    )
+    return str(path)
+
+
+def wait_for(queue, job_id, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def queue(rag_service, rag_settings, monkeypatch):
+    import rag_singleton
+    from app.services.ingestion import IngestionJobQueue
+
+    # Small batches so a failing file has already written some before it fails
+    monkeypatch.setattr(rag_settings, "INGEST_BATCH_SIZE", 4)
+    monkeypatch.setattr(rag_singleton, "_rag_service", rag_service)
+    job_queue = IngestionJobQueue(max_workers=1)
+    yield job_queue
+    job_queue._executor.shutdown(wait=True)
+    job_queue._summary_executor.shutdown(wait=True)
+
+
+def test_completed_job_stores_every_chunk(queue, rag_service, tmp_path):
+    path = write_text(tmp_path / "notes.txt", 40)
+    job = wait_for(queue, queue.submit("doc", "notes.txt", path, 0).id)
+
+    assert job.status == "completed", job.error
+    assert job.chunks_written == job.chunks_total > 0
+    assert rag_service.get_document_chunk_count("doc") == job.chunks_total
+
+
+def test_submitting_an_active_document_returns_its_job(queue, tmp_path):
+    path = write_text(tmp_path / "notes.txt", 5)
+    # Hold the only worker so the job stays queued
+    release = threading.Event()
+    queue._executor.submit(release.wait)
+
+    first = queue.submit("doc", "notes.txt", path, 0)
+    second = queue.submit("doc", "notes.txt", path, 0)
+    other = queue.submit("other", "other.txt", path, 0)
+    assert second.id == first.id
+    assert other.id != first.id
+    assert queue.get_active("doc").id == first.id
+
+    release.set()
+    assert wait_for(queue, first.id).status == "completed"
+    assert queue.get_active("doc") is None
+    # Once finished, the same document can be queued again
+    assert queue.submit("doc", "notes.txt", path, 0).id != first.id
+
+
+def test_failed_job_leaves_no_partial_chunks(queue, rag_service, tmp_path):
+    # Valid text for a few pages, then bytes that are not UTF-8
+    path = write_text(tmp_path / "broken.txt", 200, tail=b"\n\n\xff\xfe broken")
+    job = wait_for(queue, queue.submit("broken", "broken.txt", path, 0).id)
+
+    assert job.status == "failed"
+    assert job.chunks_written > 0
+    assert rag_service.get_document_chunk_count("broken") == 0
+
+
+def test_failed_reingest_keeps_the_previous_version(queue, rag_service, tmp_path):
+    good = write_text(tmp_path / "v1.txt", 40)
+    first = wait_for(queue, queue.submit("v1", "notes.txt", good, 0, document_name="notes").id)
+    assert first.status == "completed", first.error
+
+    broken = write_text(tmp_path / "v2.txt", 200, tail=b"\n\n\xff\xfe broken")
+    second = wait_for(queue, queue.submit("v2", "notes.txt", broken, 0, document_name="notes").id)
+
+    assert second.status == "failed"
+    assert rag_service.get_document_chunk_count("v2") == 0
+    assert rag_service.get_document_chunk_count("v1") == first.chunks_total
@@ -0,0 +1,215 @@
+# backend/tests/test_llm_client.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.fake_llm import FakeChatModel
+from app.services.llm_client import (
+    CircuitBreaker, ConcurrencyGate, LLMRateLimitError, LLMUnavailableError, ResilientLLMClient
+)
+
+
+def fast_client(llm, **kwargs) -> ResilientLLMClient:
+    defaults = dict(max_retries=2, backoff_base_seconds=0.001, backoff_max_seconds=0.005)
+    defaults.update(kwargs)
+    return ResilientLLMClient(llm, **defaults)
+
+
+def open_breaker(reset_seconds: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset_seconds)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+# ------------------ circuit breaker ------------------
+
+def test_breaker_opens_after_consecutive_failures_and_rejects():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 1
+    with pytest.raises(LLMUnavailableError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after > 0
+
+
+def test_breaker_half_open_trial_success_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # Only the trial runs until it reports back
+    with pytest.raises(LLMUnavailableError):
+        breaker.before_call()
+    with pytest.raises(LLMUnavailableError):
+        breaker.check()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_breaker_half_open_trial_failure_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+    with pytest.raises(LLMUnavailableError):
+        breaker.check()
+
+
+def test_check_does_not_start_a_trial():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.check()
+    assert breaker.state == "open"
+
+
+def test_cancelled_trial_call_does_not_leave_breaker_half_open():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    client = fast_client(FakeChatModel(latency_seconds=1.0), breaker=breaker)
+
+    async def cancel_trial():
+        task = asyncio.ensure_future(client.ainvoke("prompt"))
+        await asyncio.sleep(0.02)
+        assert breaker.state == "half_open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == "closed"
+
+
+def test_closed_stream_trial_does_not_leave_breaker_half_open():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    client = fast_client(FakeChatModel(tokens_per_second=1000), breaker=breaker)
+
+    async def read_one_chunk():
+        stream = client.astream("prompt")
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(read_one_chunk())
+    assert breaker.state == "closed"
+
+
+# ------------------ client ------------------
+
+def test_outage_opens_breaker_and_fails_fast():
+    fake = FakeChatModel(failure_rate=1.0)
+    client = fast_client(fake, breaker=CircuitBreaker(failure_threshold=3, reset_seconds=60))
+
+    for _ in range(3):
+        with pytest.raises(LLMUnavailableError):
+            client.invoke("prompt")
+    assert client.breaker.state == "open"
+    assert fake.calls == 3
+
+
+def test_provider_quota_errors_do_not_open_breaker():
+    fake = FakeChatModel(quota_per_minute=1)
+    client = fast_client(fake, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=60))
+    client.invoke("first")
+
+    for _ in range(3):
+        with pytest.raises(LLMRateLimitError) as excinfo:
+            client.invoke("prompt")
+        assert excinfo.value.retry_after
+    assert client.breaker.state == "closed"
+    assert client.breaker.opened == 0
+
+
+def test_rejected_call_refunds_its_quota():
+    client = fast_client(
+        FakeChatModel(), requests_per_minute=2, max_queue_seconds=0.0, breaker=open_breaker(60)
+    )
+    # The open breaker rejects before any quota is reserved ...
+    for _ in range(5):
+        with pytest.raises(LLMUnavailableError):
+            client.invoke("prompt")
+
+    # ... and a trial the breaker turns away hands its reservation back
+    client.breaker.check = lambda: None
+    for _ in range(5):
+        with pytest.raises(LLMUnavailableError):
+            client.invoke("prompt")
+    assert client.request_bucket.reserve(2) == 0.0
+
+
+def test_success_passes_through():
+    client = fast_client(FakeChatModel(responder=lambda prompt: "answer"))
+    assert client.invoke("prompt").content == "answer"
+    assert asyncio.run(client.ainvoke("prompt")).content == "answer"
+
+
+# ------------------ concurrency gate ------------------
+
+def test_gate_limit_is_shared_by_threads_and_coroutines():
+    gate = ConcurrencyGate(3)
+    active = 0
+    peak = 0
+    counter_lock = threading.Lock()
+
+    def enter():
+        nonlocal active, peak
+        with counter_lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave():
+        nonlocal active
+        with counter_lock:
+            active -= 1
+
+    def thread_worker():
+        for _ in range(5):
+            with gate:
+                enter()
+                time.sleep(0.002)
+                leave()
+
+    async def coroutine_worker():
+        for _ in range(5):
+            async with gate:
+                enter()
+                await asyncio.sleep(0.002)
+                leave()
+
+    async def cancelled_waiter():
+        task = asyncio.ensure_future(coroutine_worker())
+        await asyncio.sleep(0.003)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    async def run_coroutines():
+        await asyncio.gather(*(coroutine_worker() for _ in range(6)), cancelled_waiter())
+
+    threads = [threading.Thread(target=thread_worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(run_coroutines())
+    for thread in threads:
+        thread.join()
+
+    assert peak <= 3
+    assert active == 0
+    assert gate._in_use == 0
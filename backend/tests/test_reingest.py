@@ -0,0 +1,103 @@
+# backend/tests/test_reingest.py
+import pytest
+
+V1 = ["Cells divide by mitosis.", "Mitosis has four phases.", "Meiosis makes gametes."]
+V2 = ["Cells divide by mitosis.", "Mitosis has five phases.", "Meiosis makes gametes."]
+
+
+class FailingCollection:
+    """Chroma collection whose ``fail_at``-th ``update`` call fails"""
+
+    def __init__(self, collection, fail_at):
+        self._collection = collection
+        self.fail_at = fail_at
+        self.updates = 0
+
+    def update(self, **kwargs):
+        self.updates += 1
+        if self.updates == self.fail_at:
+            raise RuntimeError("disk full")
+        return self._collection.update(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class VectorStoreWith:
+    """Stands in for the LangChain vector store with another collection"""
+
+    def __init__(self, vectorstore, collection):
+        self._vectorstore = vectorstore
+        self._collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self._vectorstore, name)
+
+
+def stored(rag_service, document_name):
+    existing = rag_service.vectorstore._collection.get(
+        where={"document_name": document_name}, include=["metadatas", "documents"]
+    )
+    return sorted(
+        (metadata["document_id"], metadata["chunk_index"], text)
+        for metadata, text in zip(existing["metadatas"], existing["documents"])
+    )
+
+
+def test_only_changed_chunks_are_embedded(rag_service, make_chunks):
+    first = rag_service.reingest_document("notes", make_chunks("v1", V1))
+    assert first == {"added": 3, "unchanged": 0, "deleted": 0, "replaced_document_ids": []}
+
+    second = rag_service.reingest_document("notes", make_chunks("v2", V2))
+    assert second == {"added": 1, "unchanged": 2, "deleted": 1, "replaced_document_ids": ["v1"]}
+    assert stored(rag_service, "notes") == [("v2", i, text) for i, text in enumerate(V2)]
+    assert rag_service.get_document_chunk_count("v1") == 0
+
+
+def test_failure_while_streaming_keeps_the_old_version(rag_service, make_chunks):
+    rag_service.reingest_document("notes", make_chunks("v1", V1))
+
+    def broken_upload():
+        yield from make_chunks("v2", V2)[:2]
+        raise ValueError("corrupt page")
+
+    assert rag_service.reingest_document("notes", broken_upload(), batch_size=1) is None
+    # The old version is untouched; the new id's partial chunks are the caller's to drop
+    assert [chunk for chunk in stored(rag_service, "notes") if chunk[0] == "v1"] == \
+        [("v1", i, text) for i, text in enumerate(V1)]
+    assert rag_service.get_document_chunks("v1") == V1
+
+
+def test_failure_while_relabeling_restores_the_old_metadata(rag_service, make_chunks, monkeypatch):
+    rag_service.reingest_document("notes", make_chunks("v1", V1))
+    collection = FailingCollection(rag_service.vectorstore._collection, fail_at=2)
+    monkeypatch.setattr(rag_service, "vectorstore", VectorStoreWith(rag_service.vectorstore, collection))
+
+    # Two unchanged chunks are relabeled one batch at a time; the second batch fails
+    assert rag_service.reingest_document("notes", make_chunks("v2", V2), batch_size=1) is None
+    # The first relabel batch was put back
+    assert collection.updates == 3
+    assert rag_service.get_document_chunks("v1") == V1
+    assert [chunk for chunk in stored(rag_service, "notes") if chunk[0] == "v1"] == \
+        [("v1", i, text) for i, text in enumerate(V1)]
+
+
+def test_link_document_name_replaces_the_previous_version(rag_service, make_chunks):
+    rag_service.reingest_document("notes", make_chunks("v1", V1))
+    # The new upload's content was already stored without a name
+    rag_service.add_documents(make_chunks("v2", V2))
+
+    result = rag_service.link_document_name("notes", "v2")
+    assert result == {"deleted": 3, "replaced_document_ids": ["v1"]}
+    assert stored(rag_service, "notes") == [("v2", i, text) for i, text in enumerate(V2)]
+
+    # Linked chunks carry hashes, so the next version is diffed against them
+    third = rag_service.reingest_document("notes", make_chunks("v3", V2[:2]))
+    assert third == {"added": 0, "unchanged": 2, "deleted": 1, "replaced_document_ids": ["v2"]}
+
+
+@pytest.mark.parametrize("batch_size", [1, 64])
+def test_reingesting_the_same_content_changes_nothing(rag_service, make_chunks, batch_size):
+    rag_service.reingest_document("notes", make_chunks("v1", V1), batch_size=batch_size)
+    again = rag_service.reingest_document("notes", make_chunks("v1", V1), batch_size=batch_size)
+    assert again == {"added": 0, "unchanged": 3, "deleted": 0, "replaced_document_ids": []}
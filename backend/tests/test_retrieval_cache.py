@@ -0,0 +1,64 @@
+# backend/tests/test_retrieval_cache.py
+from app.services.retrieval_cache import RetrievalCache
+
+RESULTS = [{"id": "doc_0", "text": "photosynthesis", "metadata": {"document_id": "doc"}, "score": 0.9}]
+
+
+def test_results_are_served_until_the_collection_is_bumped():
+    cache = RetrievalCache(max_entries=8)
+    cache.put_results("docs", "query", 5, None, RESULTS)
+    assert cache.get_results("docs", "query", 5) == RESULTS
+    assert cache.get_results("docs", "query", 3) is None
+    assert cache.get_results("docs", "query", 5, {"document_id": "doc"}) is None
+
+    cache.bump("docs")
+    assert cache.get_results("docs", "query", 5) is None
+    # Other collections keep their results
+    cache.put_results("other", "query", 5, None, RESULTS)
+    cache.bump("docs")
+    assert cache.get_results("other", "query", 5) == RESULTS
+
+
+def test_results_computed_before_a_bump_are_never_served_after_it():
+    cache = RetrievalCache(max_entries=8)
+    version = cache.version("docs")
+    # A write lands while the vector query runs
+    cache.bump("docs")
+    cache.put_results("docs", "query", 5, None, RESULTS, version)
+
+    assert cache.get_results("docs", "query", 5) is None
+
+
+def test_returned_results_are_copies():
+    cache = RetrievalCache(max_entries=8)
+    cache.put_results("docs", "query", 5, None, RESULTS)
+    cache.get_results("docs", "query", 5)[0]["score"] = 0.0
+    assert cache.get_results("docs", "query", 5) == RESULTS
+
+
+def test_shared_path_creates_its_directory_and_shares_invalidations(tmp_path):
+    shared_path = str(tmp_path / "missing" / "dir" / "retrieval.sqlite3")
+    first = RetrievalCache(max_entries=8, shared_path=shared_path)
+    second = RetrievalCache(max_entries=8, shared_path=shared_path)
+
+    first.put_results("docs", "query", 5, None, RESULTS)
+    assert second.get_results("docs", "query", 5) == RESULTS
+
+    second.bump("docs")
+    assert first.version("docs") == 1
+    assert first.get_results("docs", "query", 5) is None
+
+
+def test_search_sees_documents_written_after_it_was_cached(rag_service, make_chunks):
+    rag_service.add_documents(make_chunks("plants", ["Photosynthesis turns light into sugar."]))
+    first = rag_service.search("how do plants make sugar", k=5)
+    assert [r["metadata"]["document_id"] for r in first] == ["plants"]
+    assert rag_service.search("how do plants make sugar", k=5) == first
+
+    rag_service.add_documents(make_chunks("leaves", ["Chlorophyll in leaves absorbs light for sugar production."]))
+    after_add = rag_service.search("how do plants make sugar", k=5)
+    assert {r["metadata"]["document_id"] for r in after_add} == {"plants", "leaves"}
+
+    rag_service.delete_document("leaves")
+    after_delete = rag_service.search("how do plants make sugar", k=5)
+    assert [r["metadata"]["document_id"] for r in after_delete] == ["plants"]
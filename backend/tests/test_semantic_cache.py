@@ -0,0 +1,83 @@
+# backend/tests/test_semantic_cache.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.semantic_cache import SemanticCache, normalize_topic  # noqa: E402
+
+VOCABULARY = ["cell", "division", "mitosis", "meiosis", "plant", "photosynthesis", "history"]
+
+
+def embed(topic):
+    """Unit-length bag of words over a tiny vocabulary"""
+    words = topic.split()
+    vector = np.array([words.count(word) for word in VOCABULARY] + [0.01], dtype=np.float32)
+    return list(vector / np.linalg.norm(vector))
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    return SemanticCache(embed, threshold=kwargs.pop("threshold", 0.8), **kwargs)
+
+
+def test_normalize_topic():
+    assert normalize_topic("  Cell-Division?! ") == "cell division"
+
+
+def test_similar_topics_share_a_result():
+    cache = make_cache()
+    cache.store("qa", "bio", "Cell division and mitosis", {"count": 5}, {"answer": 1})
+
+    hit = cache.lookup("qa", "bio", "mitosis, cell division", {"count": 5})
+    assert hit["result"] == {"answer": 1}
+    assert hit["topic"] == "Cell division and mitosis"
+    assert hit["similarity"] >= 0.8
+
+    assert cache.lookup("qa", "bio", "plant photosynthesis", {"count": 5}) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_results_stay_within_their_scope():
+    cache = make_cache()
+    cache.store("qa", "bio", "mitosis", {"count": 5}, {"answer": 1})
+
+    assert cache.lookup("qa", "bio", "mitosis", {"count": 10}) is None
+    assert cache.lookup("qa", "other", "mitosis", {"count": 5}) is None
+    assert cache.lookup("flashcards", "bio", "mitosis", {"count": 5}) is None
+
+
+def test_invalidate_documents_drops_only_their_entries():
+    cache = make_cache()
+    cache.store("qa", "bio", "mitosis", {}, {"answer": 1})
+    cache.store("summary", "bio", "meiosis", {}, {"answer": 2})
+    cache.store("qa", "history", "history", {}, {"answer": 3})
+
+    assert cache.invalidate_documents(["bio"]) == 2
+    assert cache.lookup("qa", "bio", "mitosis", {}) is None
+    assert cache.lookup("summary", "bio", "meiosis", {}) is None
+    assert cache.lookup("qa", "history", "history", {})["result"] == {"answer": 3}
+    assert cache.invalidate_documents([]) == 0
+    assert cache.stats()["invalidated"] == 2
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = make_cache(max_entries=2)
+    cache.store("qa", "bio", "mitosis", {}, {"answer": 1})
+    cache.store("qa", "bio", "meiosis", {}, {"answer": 2})
+    cache.store("qa", "bio", "photosynthesis", {}, {"answer": 3})
+
+    assert cache.lookup("qa", "bio", "mitosis", {}) is None
+    assert cache.lookup("qa", "bio", "meiosis", {})["result"] == {"answer": 2}
+
+
+def test_writing_a_document_drops_its_cached_results(rag_settings, monkeypatch, request, make_chunks):
+    monkeypatch.setattr(rag_settings, "SEMANTIC_CACHE_ENABLED", True)
+    rag_service = request.getfixturevalue("rag_service")
+    cache = rag_service.semantic_cache
+    cache.store("qa", "bio", "mitosis", {}, {"answer": 1})
+    cache.store("qa", "history", "history", {}, {"answer": 2})
+
+    rag_service.add_documents(make_chunks("bio", ["Mitosis splits one cell into two."]))
+
+    assert cache.lookup("qa", "bio", "mitosis", {}) is None
+    assert cache.lookup("qa", "history", "history", {})["result"] == {"answer": 2}
@@ -0,0 +1,87 @@
+# backend/tests/test_single_flight.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services.single_flight import SingleFlight, request_key  # noqa: E402
+
+
+def test_request_key_ignores_topic_spelling_and_param_order():
+    assert request_key("qa", {"topic": "Cell Division?", "count": 5}) == \
+        request_key("qa", {"count": 5, "topic": "cell  division"})
+    assert request_key("qa", {"topic": "cell division"}) != request_key("flashcards", {"topic": "cell division"})
+
+
+def test_identical_calls_run_once_and_share_the_result():
+    flights = SingleFlight()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"answer": runs}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert runs == 1
+    assert results == [{"answer": 1}] * 5
+    assert flights.stats()["executed"] == 1
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_different_keys_and_later_calls_run_separately():
+    flights = SingleFlight()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0)
+        return runs
+
+    async def main():
+        await asyncio.gather(flights.do("a", work), flights.do("b", work))
+        await flights.do("a", work)
+
+    asyncio.run(main())
+    assert runs == 3
+
+
+def test_an_exception_reaches_every_waiting_caller():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats()["executed"] == 1
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("key", work))
+        second = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"